@@ -71,4 +71,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use the faster libuv-based event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -4,6 +4,7 @@
 import asyncio
 import logging
 import json
+from collections import Counter
 from datetime import datetime, timedelta
 from uuid import UUID
 
@@ -36,45 +37,73 @@ async def main():
         # Analyze the data
         total_jobs = set()
         total_cut_time = 0
+        runs_with_times = 0
         
-        for run in runs:
+        async def fetch_run_details(job_guid, semaphore):
+            """Fetch job, plan and part information for a run concurrently."""
+            async with semaphore:
+                guid = UUID(job_guid)
+                return await asyncio.gather(
+                    client.get_job_info(guid),
+                    client.get_plan_info(guid),
+                    client.get_part_info(guid),
+                    return_exceptions=True
+                )
+        
+        # Only runs with a job have details to fetch
+        job_run_indexes = [index for index, run in enumerate(runs) if run.get('JobGuid')]
+        
+        # Limit in-flight requests to avoid overwhelming the server
+        semaphore = asyncio.Semaphore(8)
+        fetched = await asyncio.gather(*(
+            fetch_run_details(runs[index]['JobGuid'], semaphore)
+            for index in job_run_indexes
+        ), return_exceptions=True)
+        details = dict(zip(job_run_indexes, fetched))
+        
+        for index, run in enumerate(runs):
             job_guid = run.get('JobGuid')
             run_guid = run.get('RunGuid')
             
             if job_guid:
                 total_jobs.add(job_guid)
+            if run.get('CutStartTime') and run.get('CutEndTime'):
+                runs_with_times += 1
             
-            # Get detailed information for each run
+            # Show detailed information for each run
             logger.info(f"\\nProcessing run: {run_guid}")
             logger.info(f"  Job GUID: {job_guid}")
             logger.info(f"  Start Time: {run.get('CutStartTime')}")
             logger.info(f"  End Time: {run.get('CutEndTime')}")
             
-            # Get job information
-            if job_guid:
-                try:
-                    job_info = await client.get_job_info(UUID(job_guid))
-                    if job_info:
-                        logger.info(f"  Job Name: {job_info.get('Name', 'Unknown')}")
-                    
-                    # Get plan information
-                    plan_info = await client.get_plan_info(UUID(job_guid))
-                    if plan_info:
-                        logger.info(f"  Plan: {plan_info.get('Name', 'Unknown')}")
-                        logger.info(f"  Material: {plan_info.get('MaterialThickness', 0)}mm")
-                    
-                    # Get part information
-                    part_info = await client.get_part_info(UUID(job_guid))
-                    if part_info:
-                        logger.info(f"  Part: {part_info.get('Name', 'Unknown')}")
-                        logger.info(f"  Quantity: {part_info.get('Quantity', 0)}")
-                        logger.info(f"  Order: {part_info.get('OrderInfo', 'N/A')}")
-                
-                except Exception as e:
-                    logger.error(f"  Error getting job details: {e}")
+            run_details = details.get(index)
+            if run_details is None:
+                continue
+            
+            if isinstance(run_details, Exception):
+                logger.error(f"  Error getting job details: {run_details}")
+                continue
             
-            # Add small delay to avoid overwhelming the server
-            await asyncio.sleep(0.5)
+            # Each detail is fetched separately, so one failure keeps the others
+            job_info, plan_info, part_info = run_details
+            
+            if isinstance(job_info, Exception):
+                logger.error(f"  Error getting job info: {job_info}")
+            elif job_info:
+                logger.info(f"  Job Name: {job_info.get('Name', 'Unknown')}")
+            
+            if isinstance(plan_info, Exception):
+                logger.error(f"  Error getting plan info: {plan_info}")
+            elif plan_info:
+                logger.info(f"  Plan: {plan_info.get('Name', 'Unknown')}")
+                logger.info(f"  Material: {plan_info.get('MaterialThickness', 0)}mm")
+            
+            if isinstance(part_info, Exception):
+                logger.error(f"  Error getting part info: {part_info}")
+            elif part_info:
+                logger.info(f"  Part: {part_info.get('Name', 'Unknown')}")
+                logger.info(f"  Quantity: {part_info.get('Quantity', 0)}")
+                logger.info(f"  Order: {part_info.get('OrderInfo', 'N/A')}")
         
         # Summary
         logger.info("\\n" + "="*50)
@@ -85,14 +114,12 @@ async def main():
         logger.info(f"Unique Jobs: {len(total_jobs)}")
         
         # Calculate production statistics
-        if runs:
-            runs_with_times = [r for r in runs if r.get('CutStartTime') and r.get('CutEndTime')]
-            if runs_with_times:
-                logger.info(f"Runs with timing data: {len(runs_with_times)}")
-                
-                # Calculate average run time (if possible)
-                # Note: This would require parsing the timestamp strings
-                logger.info("Timing analysis would require date parsing implementation")
+        if runs_with_times:
+            logger.info(f"Runs with timing data: {runs_with_times}")
+            
+            # Calculate average run time (if possible)
+            # Note: This would require parsing the timestamp strings
+            logger.info("Timing analysis would require date parsing implementation")
 
 
 async def analyze_machine_utilization(client: BystronicClient, days: int = 7):
@@ -110,17 +137,10 @@ async def analyze_machine_utilization(client: BystronicClient, days: int = 7):
     runs = await client.get_run_history(start_time, end_time, page_size=1000)
     
     if runs:
-        # Group by day
-        daily_runs = {}
-        for run in runs:
-            start_time_str = run.get('CutStartTime')
-            if start_time_str:
-                try:
-                    # Parse the date (simplified)
-                    date = start_time_str.split('T')[0]
-                    daily_runs[date] = daily_runs.get(date, 0) + 1
-                except Exception:
-                    continue
+        # Group by day (CutStartTime is ISO-8601, so the date is the first 10 characters)
+        daily_runs = Counter(
+            run['CutStartTime'][:10] for run in runs if run.get('CutStartTime')
+        )
         
         logger.info("\\nDaily run counts:")
         for date, count in sorted(daily_runs.items()):
@@ -128,4 +148,11 @@ async def analyze_machine_utilization(client: BystronicClient, days: int = 7):
 
 
 if __name__ == "__main__":
+    # Use the faster libuv-based event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
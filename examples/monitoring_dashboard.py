@@ -84,6 +84,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use the faster libuv-based event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
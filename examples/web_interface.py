@@ -3,7 +3,6 @@
 
 import asyncio
 import logging
-from threading import Thread
 
 from bystronic_opc.web import create_app
 
@@ -32,6 +31,11 @@ def main():
         'DEBUG': True,  # Set to False in production
         'HOST': '0.0.0.0',
         'PORT': 5000,
+        # 'eventlet' or 'gevent' serve many dashboard clients from one thread,
+        # but their monkey patching would turn the monitor's thread and
+        # asyncio loop into green threads and break asyncua, so threading
+        # mode is used.
+        'SOCKETIO_ASYNC_MODE': 'threading',
     }
     
     logger.info("Creating Bystronic OPC web application...")
@@ -43,18 +47,16 @@ def main():
     for name, url in machines.items():
         logger.info(f"  - {name}: {url}")
     
-    # Start monitoring in background thread
-    def start_monitoring():
-        """Start machine monitoring in background."""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(app.monitor.start_monitoring())
-        except Exception as e:
-            logger.error(f"Error starting monitoring: {e}")
-    
-    monitor_thread = Thread(target=start_monitoring, daemon=True)
-    monitor_thread.start()
+    # The app runs one long-lived event loop in a background thread, shared
+    # by the monitor and the API handlers
+    loop = app.extensions['bystronic_loop']
+    loop_thread = app.extensions['bystronic_loop_thread']
+    try:
+        asyncio.run_coroutine_threadsafe(
+            app.monitor.start_monitoring(), loop
+        ).result()
+    except Exception as e:
+        logger.error(f"Error starting monitoring: {e}")
     
     logger.info("Starting web server...")
     logger.info(f"Dashboard will be available at: http://localhost:{config['PORT']}")
@@ -75,11 +77,17 @@ def main():
     # Stop monitoring
     logger.info("Stopping machine monitoring...")
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(app.monitor.stop_monitoring())
+        # Stop on the same loop the monitor was started on
+        asyncio.run_coroutine_threadsafe(
+            app.monitor.stop_monitoring(), loop
+        ).result()
     except Exception as e:
         logger.error(f"Error stopping monitoring: {e}")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=5)
+        if not loop_thread.is_alive():
+            loop.close()
     
     logger.info("Web interface stopped")
 
@@ -42,13 +42,18 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.0.0",
-            "pytest-asyncio>=0.21.0",
+            "pytest-asyncio>=0.24.0",
             "black>=22.0.0",
             "flake8>=4.0.0",
             "mypy>=1.0.0",
         ],
         "web": [
             "flask>=2.0.0",
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+            "orjson>=3.6.0",
+        ],
+        "speedups": [
+            "orjson>=3.6.0",
         ],
         "docs": [
             "sphinx>=4.0.0",
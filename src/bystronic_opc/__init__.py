@@ -5,9 +5,10 @@ machines via OPC UA protocol.
 """
 
 from .client import BystronicClient
+from .connection import BystronicConnectionManager
 from .monitor import MachineMonitor
 from .data_types import JobInfo, PlanInfo, PartInfo, RunInfo, MachineStatus
-from .exceptions import BystronicOPCError, ConnectionError, DataError
+from .exceptions import BystronicOPCError, ConnectionCooldownError, ConnectionError, DataError
 
 __version__ = "0.1.0"
 __author__ = "Daniel Risto"
@@ -15,6 +16,7 @@ __email__ = "daniel@risto.de"
 
 __all__ = [
     "BystronicClient",
+    "BystronicConnectionManager",
     "MachineMonitor", 
     "JobInfo",
     "PlanInfo",
@@ -23,5 +25,6 @@ __all__ = [
     "MachineStatus",
     "BystronicOPCError",
     "ConnectionError",
+    "ConnectionCooldownError",
     "DataError",
 ]
\ No newline at end of file
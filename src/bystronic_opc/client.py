@@ -1,15 +1,14 @@
 """Main Bystronic OPC UA Client implementation."""
 
 import asyncio
+import logging
 import struct
-import json
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple, Union
 from uuid import UUID
 import io
 
-from asyncua import Client, ua
-from PIL import Image
+from asyncua import Client, Node, ua
 
 from .data_types import (
     JobInfo, 
@@ -23,6 +22,29 @@ from .data_types import (
 from .exceptions import ConnectionError, DataError, MethodCallError
 
 
+_json_loads: Callable[[Union[str, bytes]], Any]
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - fall back to the standard library
+    from json import loads as _json_loads
+
+
+logger = logging.getLogger(__name__)
+
+
+# Pre-compiled binary layouts used when decoding extension objects
+_U32 = struct.Struct("<I")
+_PLAN_TAIL = struct.Struct("<dddiiid")
+
+
+def _decode_png(data: bytes) -> Any:
+    """Decode PNG data into an RGB Pillow image."""
+    # Imported lazily so Pillow is only loaded when images are decoded
+    from PIL import Image
+    
+    return Image.open(io.BytesIO(data)).convert("RGB")
+
+
 class BystronicClient:
     """Client for connecting to Bystronic laser cutting machines via OPC UA."""
     
@@ -42,6 +64,12 @@ class BystronicClient:
         "GetPartOperatingDataHistory": "History.GetPartOperatingDataHistory",
     }
     
+    # NodeIds for the objects and methods above, built once
+    OBJECT_NODE_IDS = {
+        name: ua.NodeId(path.split('.')[0], 2) for name, path in METHODS.items()
+    }
+    METHOD_NODE_IDS = {name: ua.NodeId(path, 2) for name, path in METHODS.items()}
+    
     # Laser parameter node IDs
     LASER_NODES = [
         "ns=2;s=Laser.CurrentLaserPower",
@@ -52,25 +80,58 @@ class BystronicClient:
         "ns=2;s=Laser.ProcessOperationMode",
     ]
     
-    def __init__(self, url: str, timeout: int = 10):
+    # Fixed GetScreenImage arguments
+    SCREEN_IMAGE_ARGS = [
+        ua.Variant(1200, ua.VariantType.Int32),  # page
+        ua.Variant(0, ua.VariantType.Int32),     # page size
+    ]
+    
+    # Parameter names keyed by position in LASER_NODES
+    LASER_KEYS = tuple(node_id.split('.')[-1] for node_id in LASER_NODES)
+    
+    # Session and secure channel lifetime requested from the server (ms).
+    # Kept short so sessions of vanished clients are released quickly; the
+    # asyncua watchdog keeps live sessions alive.
+    SESSION_TIMEOUT = 60000
+    
+    # Upper bound for the delay between reconnect attempts (s)
+    MAX_RECONNECT_DELAY = 30
+    
+    def __init__(self, url: str, timeout: float = 10, reconnect_attempts: int = 3):
         """Initialize the Bystronic OPC UA client.
         
         Args:
             url: OPC UA server URL (e.g., "opc.tcp://192.168.1.100:56000")
             timeout: Connection timeout in seconds
+            reconnect_attempts: Attempts to re-establish a lost connection
         """
         self.url = url
         self.timeout = timeout
+        self.reconnect_attempts = reconnect_attempts
+        self.connection_id = 0
         self._client = Client(url)
+        self._client.session_timeout = self.SESSION_TIMEOUT
+        self._client.secure_channel_timeout = self.SESSION_TIMEOUT
         self._connected = False
+        self._reconnect_lock: Optional[asyncio.Lock] = None
+        self._node_cache: Dict[Union[str, ua.NodeId], Node] = {}
+        self._laser_nodes: Optional[List[Node]] = None
+        self._current_job_node: Optional[Node] = None
     
     async def connect(self) -> None:
         """Connect to the OPC UA server."""
         try:
             await self._client.connect()
             self._connected = True
+            self.connection_id += 1
         except Exception as e:
             raise ConnectionError(f"Failed to connect to {self.url}: {e}")
+        
+        # Prewarm the node cache with the nodes used on every poll
+        self._get_laser_nodes()
+        for name in self.METHODS:
+            self._node(self.OBJECT_NODE_IDS[name])
+            self._node(self.METHOD_NODE_IDS[name])
     
     async def disconnect(self) -> None:
         """Disconnect from the OPC UA server."""
@@ -87,15 +148,101 @@ class BystronicClient:
         """Async context manager exit."""
         await self.disconnect()
     
+    def _node(self, node_id: Union[str, ua.NodeId]) -> Node:
+        """Get a node object, reusing a cached instance when available.
+        
+        Args:
+            node_id: Node identifier string or NodeId
+            
+        Returns:
+            Node object for the identifier
+        """
+        node = self._node_cache.get(node_id)
+        if node is None:
+            node = self._client.get_node(node_id)
+            self._node_cache[node_id] = node
+        return node
+    
+    def _get_laser_nodes(self) -> List[Node]:
+        """Get the laser parameter nodes in LASER_NODES order."""
+        if self._laser_nodes is None:
+            self._laser_nodes = [self._node(node_id) for node_id in self.LASER_NODES]
+        return self._laser_nodes
+    
+    async def _get_current_job_node(self) -> Node:
+        """Get the CurrentJob node, browsing for it only once."""
+        if self._current_job_node is None:
+            work_node = await self._client.nodes.root.get_child(["0:Objects", "2:Work"])
+            self._current_job_node = await work_node.get_child(["2:CurrentJob"])
+        return self._current_job_node
+    
     def _ensure_connected(self) -> None:
         """Ensure client is connected."""
         if not self._connected:
             raise ConnectionError("Client is not connected. Call connect() first.")
     
+    def _connection_lost(self) -> bool:
+        """Check whether the underlying socket was closed by the peer."""
+        protocol = self._client.uaclient.protocol
+        if protocol is None:
+            return False
+        state = getattr(protocol.state, "value", protocol.state)
+        return state == "closed"
+    
+    async def ensure_connected(self) -> None:
+        """Ensure client is connected, reconnecting a lost connection.
+        
+        Each reconnect attempt is limited to ``timeout`` seconds, and
+        attempts back off exponentially, capped at MAX_RECONNECT_DELAY
+        seconds.
+        
+        Raises:
+            ConnectionError: If connect() was never called or the lost
+                connection could not be re-established
+        """
+        self._ensure_connected()
+        if not self._connection_lost():
+            return
+        
+        if self._reconnect_lock is None:
+            self._reconnect_lock = asyncio.Lock()
+        
+        async with self._reconnect_lock:
+            # Another caller may have reconnected while we waited
+            if not self._connection_lost():
+                return
+            
+            logger.warning("Connection to %s lost, reconnecting", self.url)
+            try:
+                await self._client.disconnect()
+            except Exception:
+                pass
+            
+            for attempt in range(self.reconnect_attempts):
+                try:
+                    # Bounded like the connection manager's connects, so a
+                    # hung server cannot block the caller indefinitely
+                    await asyncio.wait_for(self.connect(), timeout=self.timeout)
+                    logger.info("Reconnected to %s", self.url)
+                    return
+                except asyncio.TimeoutError:
+                    logger.warning("Reconnect to %s timed out", self.url)
+                    try:
+                        self._client.disconnect_socket()
+                    except Exception:
+                        pass
+                except ConnectionError as e:
+                    logger.warning("Reconnect to %s failed: %s", self.url, e)
+                if attempt + 1 < self.reconnect_attempts:
+                    await asyncio.sleep(min(2 ** attempt, self.MAX_RECONNECT_DELAY))
+            
+            self._connected = False
+            raise ConnectionError(f"Failed to reconnect to {self.url}")
+    
     async def _call_method(
         self,
-        object_node_id: str,
-        method_node_id: str,
+        object_node_id: Union[str, ua.NodeId],
+        method_node_id: Union[str, ua.NodeId],
         input_args: List[ua.Variant]
     ) -> Any:
         """Call an OPC UA method with error handling.
@@ -108,11 +255,11 @@ class BystronicClient:
         Returns:
             Method result
         """
-        self._ensure_connected()
+        await self.ensure_connected()
         
         try:
-            object_node = self._client.get_node(object_node_id)
-            method_node = self._client.get_node(method_node_id)
+            object_node = self._node(object_node_id)
+            method_node = self._node(method_node_id)
             result = await object_node.call_method(method_node, *input_args)
             return result
         except Exception as e:
@@ -128,21 +275,23 @@ class BystronicClient:
             if len(body) < 36:
                 return None
             
-            # Extract GUID
-            guid_parts = struct.unpack("<IHH8s", body[:16])
-            guid_str = f"{guid_parts[0]:08x}-{guid_parts[1]:04x}-{guid_parts[2]:04x}-{guid_parts[3].hex()[:4]}-{guid_parts[3].hex()[4:]}"
+            # Work on a memoryview so slicing does not copy the body
+            body = memoryview(body)
+            
+            # Extract GUID (stored in the .NET/OPC UA mixed-endian layout)
+            guid = UUID(bytes_le=bytes(body[:16]))
             
             # Extract name
-            name_length = struct.unpack("<I", body[32:36])[0]
-            name = body[36:36 + name_length].decode("utf-8")
+            name_length = _U32.unpack_from(body, 32)[0]
+            name = str(body[36:36 + name_length], "utf-8")
             
             # Extract file path
             file_path_start = 36 + name_length
-            file_path_length = struct.unpack("<I", body[file_path_start:file_path_start + 4])[0]
-            file_path = body[file_path_start + 4:file_path_start + 4 + file_path_length].decode("utf-8")
+            file_path_length = _U32.unpack_from(body, file_path_start)[0]
+            file_path = str(body[file_path_start + 4:file_path_start + 4 + file_path_length], "utf-8")
             
             return JobInfo(
-                guid=UUID(guid_str),
+                guid=guid,
                 name=name,
                 file_path=file_path
             )
@@ -159,34 +308,31 @@ class BystronicClient:
             if len(body) < 36:
                 return None
             
-            # Extract job GUID
-            job_guid_parts = struct.unpack("<IHH8s", body[:16])
-            job_guid_str = f"{job_guid_parts[0]:08x}-{job_guid_parts[1]:04x}-{job_guid_parts[2]:04x}-{job_guid_parts[3].hex()[:4]}-{job_guid_parts[3].hex()[4:]}"
+            # Work on a memoryview so slicing does not copy the body
+            body = memoryview(body)
             
-            # Extract plan GUID
-            plan_guid_parts = struct.unpack("<IHH8s", body[16:32])
-            plan_guid_str = f"{plan_guid_parts[0]:08x}-{plan_guid_parts[1]:04x}-{plan_guid_parts[2]:04x}-{plan_guid_parts[3].hex()[:4]}-{plan_guid_parts[3].hex()[4:]}"
+            # Extract job and plan GUIDs
+            job_guid = UUID(bytes_le=bytes(body[:16]))
+            plan_guid = UUID(bytes_le=bytes(body[16:32]))
             
             # Extract name
-            name_length = struct.unpack("<I", body[32:36])[0]
-            name = body[36:36 + name_length].decode("utf-8")
-            
-            # Extract additional plan information
-            offset = 36 + name_length
-            size_x, size_y, material_thickness = struct.unpack("<ddd", body[offset:offset + 24])
-            offset += 24
-            
-            total_runs, total_parts = struct.unpack("<ii", body[offset:offset + 8])
-            offset += 8
-            
-            plan_state = struct.unpack("<i", body[offset:offset + 4])[0]
-            offset += 4
+            name_length = _U32.unpack_from(body, 32)[0]
+            name = str(body[36:36 + name_length], "utf-8")
             
-            estimated_cut_time = struct.unpack("<d", body[offset:offset + 8])[0]
+            # Extract additional plan information (sizes, counts, state, cut time)
+            (
+                size_x,
+                size_y,
+                material_thickness,
+                total_runs,
+                total_parts,
+                plan_state,
+                estimated_cut_time,
+            ) = _PLAN_TAIL.unpack_from(body, 36 + name_length)
             
             return PlanInfo(
-                job_guid=UUID(job_guid_str),
-                plan_guid=UUID(plan_guid_str),
+                job_guid=job_guid,
+                plan_guid=plan_guid,
                 name=name,
                 size_x=size_x,
                 size_y=size_y,
@@ -205,9 +351,11 @@ class BystronicClient:
         Returns:
             Current job information or None if no job is active
         """
+        await self.ensure_connected()
+        
         try:
-            work_node = await self._client.nodes.root.get_child(["0:Objects", "2:Work"])
-            current_job = await (await work_node.get_child(["2:CurrentJob"])).get_value()
+            job_node = await self._get_current_job_node()
+            current_job = await job_node.get_value()
             return self._decode_job_info(current_job)
         except Exception as e:
             raise DataError(f"Failed to get current job: {e}")
@@ -223,11 +371,11 @@ class BystronicClient:
         """
         input_args = [ua.Variant(job_guid, ua.VariantType.Guid)]
         result = await self._call_method(
-            ua.NodeId("History", 2),
-            ua.NodeId("History.GetJobInfo", 2),
+            self.OBJECT_NODE_IDS["GetJobInfo"],
+            self.METHOD_NODE_IDS["GetJobInfo"],
             input_args
         )
-        return json.loads(result) if result else None
+        return _json_loads(result) if result else None
     
     async def get_plan_info(self, job_guid: UUID) -> Optional[Dict[str, Any]]:
         """Get plan information for a job.
@@ -240,12 +388,12 @@ class BystronicClient:
         """
         input_args = [ua.Variant(job_guid, ua.VariantType.Guid)]
         result = await self._call_method(
-            ua.NodeId("History", 2),
-            ua.NodeId("History.GetPlanInfos", 2),
+            self.OBJECT_NODE_IDS["GetPlanInfos"],
+            self.METHOD_NODE_IDS["GetPlanInfos"],
             input_args
         )
         if result:
-            data = json.loads(result)
+            data = _json_loads(result)
             return data[0] if data else None
         return None
     
@@ -260,12 +408,12 @@ class BystronicClient:
         """
         input_args = [ua.Variant(job_guid, ua.VariantType.Guid)]
         result = await self._call_method(
-            ua.NodeId("History", 2),
-            ua.NodeId("History.GetPartInfos", 2),
+            self.OBJECT_NODE_IDS["GetPartInfos"],
+            self.METHOD_NODE_IDS["GetPartInfos"],
             input_args
         )
         if result and result != "[]":
-            data = json.loads(result)
+            data = _json_loads(result)
             return data[0] if data else None
         return None
     
@@ -295,32 +443,88 @@ class BystronicClient:
         ]
         
         result = await self._call_method(
-            ua.NodeId("History", 2),
-            ua.NodeId("History.GetRunHistory", 2),
+            self.OBJECT_NODE_IDS["GetRunHistory"],
+            self.METHOD_NODE_IDS["GetRunHistory"],
             input_args
         )
         
         if result and len(result) > 1:
-            return json.loads(result[1])
+            return _json_loads(result[1])
         return []
     
+    async def iter_run_history(
+        self,
+        from_timestamp: datetime,
+        to_timestamp: datetime,
+        page_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all run history entries within a time range.
+        
+        Pages are fetched on demand, and the next page is requested while
+        the current one is being consumed, so only about two pages are held
+        in memory at a time.
+        
+        Args:
+            from_timestamp: Start time
+            to_timestamp: End time
+            page_size: Number of entries per page (default: 100)
+            
+        Yields:
+            Run history entries
+        """
+        page = 1
+        runs = await self.get_run_history(from_timestamp, to_timestamp, page, page_size)
+        
+        while runs:
+            # A short page is the last one
+            next_page = None
+            if len(runs) >= page_size:
+                next_page = asyncio.create_task(
+                    self.get_run_history(from_timestamp, to_timestamp, page + 1, page_size)
+                )
+            
+            try:
+                for run in runs:
+                    yield run
+            except BaseException:
+                if next_page is not None:
+                    next_page.cancel()
+                raise
+            
+            if next_page is None:
+                break
+            
+            page += 1
+            runs = await next_page
+    
     async def get_laser_parameters(self) -> LaserParameters:
         """Get current laser parameters.
         
         Returns:
             Current laser parameters
         """
-        values = {}
+        await self.ensure_connected()
         
-        for node_id in self.LASER_NODES:
-            try:
-                node = self._client.get_node(node_id)
-                value = await node.read_value()
-                values[node_id.split('.')[-1]] = value
-            except Exception as e:
-                print(f"Failed to read {node_id}: {e}")
-                values[node_id.split('.')[-1]] = None
+        nodes = self._get_laser_nodes()
         
+        try:
+            # Read all parameters in a single request
+            values = dict(zip(self.LASER_KEYS, await self._client.read_values(nodes)))
+        except Exception:
+            # Fall back to individual reads so one bad node doesn't fail all
+            values = {}
+            for node_id, key, node in zip(self.LASER_NODES, self.LASER_KEYS, nodes):
+                try:
+                    values[key] = await node.read_value()
+                except Exception as e:
+                    logger.warning("Failed to read %s: %s", node_id, e)
+                    values[key] = None
+        
+        return self._build_laser_parameters(values)
+    
+    @staticmethod
+    def _build_laser_parameters(values: Dict[str, Any]) -> LaserParameters:
+        """Build laser parameters from values keyed by LASER_KEYS."""
         return LaserParameters(
             current_laser_power=values.get('CurrentLaserPower', 0.0),
             gas_channel=values.get('GasChannel', 0),
@@ -330,41 +534,137 @@ class BystronicClient:
             process_operation_mode=values.get('ProcessOperationMode', 0)
         )
     
+    async def subscribe_laser(self, handler: Any, interval_ms: int = 500) -> Any:
+        """Subscribe to laser parameter changes.
+        
+        The server pushes new values to ``handler.datachange_notification``
+        whenever a laser parameter changes instead of being polled.
+        
+        Args:
+            handler: Subscription handler implementing datachange_notification
+            interval_ms: Publishing interval in milliseconds
+            
+        Returns:
+            The created OPC UA subscription
+        """
+        await self.ensure_connected()
+        
+        try:
+            subscription = await self._client.create_subscription(interval_ms, handler)
+            await subscription.subscribe_data_change(self._get_laser_nodes())
+            return subscription
+        except Exception as e:
+            raise DataError(f"Failed to subscribe to laser parameters: {e}")
+    
+    async def subscribe_status(self, handler: Any, interval_ms: int = 500) -> Any:
+        """Subscribe to current job and laser parameter changes.
+        
+        Like subscribe_laser, but the CurrentJob node is monitored as well,
+        so the whole machine status is pushed by the server.
+        
+        Args:
+            handler: Subscription handler implementing datachange_notification
+            interval_ms: Publishing interval in milliseconds
+            
+        Returns:
+            The created OPC UA subscription
+        """
+        await self.ensure_connected()
+        
+        try:
+            job_node = await self._get_current_job_node()
+            subscription = await self._client.create_subscription(interval_ms, handler)
+            await subscription.subscribe_data_change([job_node, *self._get_laser_nodes()])
+            return subscription
+        except Exception as e:
+            raise DataError(f"Failed to subscribe to machine status: {e}")
+    
     async def get_screen_image(self) -> bytes:
         """Capture machine screen image.
         
         Returns:
             PNG image data as bytes
         """
-        input_args = [
-            ua.Variant(1200, ua.VariantType.Int32),  # page
-            ua.Variant(0, ua.VariantType.Int32),     # page size
-        ]
-        
         result = await self._call_method(
-            ua.NodeId("ImageProvider", 2),
-            ua.NodeId("ImageProvider.GetScreenImage", 2),
-            input_args
+            self.OBJECT_NODE_IDS["GetScreenImage"],
+            self.METHOD_NODE_IDS["GetScreenImage"],
+            self.SCREEN_IMAGE_ARGS
         )
         
         return result
     
+    async def get_screen_picture(self) -> Any:
+        """Capture machine screen image and decode it.
+        
+        Decoding is CPU bound, so it runs in a worker thread to keep the
+        event loop responsive.
+        
+        Returns:
+            RGB ``PIL.Image.Image`` of the machine screen
+        """
+        data = await self.get_screen_image()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _decode_png, data)
+    
+    async def _read_status_values(self) -> Tuple[Optional[JobInfo], LaserParameters]:
+        """Read current job and laser parameters in a single request.
+        
+        Returns:
+            Tuple of current job information and laser parameters
+        """
+        await self.ensure_connected()
+        
+        job_node = await self._get_current_job_node()
+        values = await self._client.read_values([job_node, *self._get_laser_nodes()])
+        
+        return (
+            self._decode_job_info(values[0]),
+            self._build_laser_parameters(dict(zip(self.LASER_KEYS, values[1:])))
+        )
+    
     async def get_machine_status(self) -> MachineStatus:
         """Get comprehensive machine status.
         
         Returns:
             Current machine status
         """
+        current_job: Optional[JobInfo]
+        laser_params: Optional[LaserParameters]
+        error_message: Optional[str] = None
+        
         try:
-            current_job = await self.get_current_job()
-            laser_params = await self.get_laser_parameters()
+            try:
+                current_job, laser_params = await self._read_status_values()
+            except Exception:
+                # Fall back to separate reads, issued concurrently
+                job_result, laser_result = await asyncio.gather(
+                    self.get_current_job(),
+                    self.get_laser_parameters(),
+                    return_exceptions=True
+                )
+                if isinstance(job_result, BaseException) and isinstance(laser_result, BaseException):
+                    raise job_result
+                
+                # Return what could be read, with the error of the other part
+                if isinstance(job_result, BaseException):
+                    error_message = str(job_result)
+                    current_job = None
+                else:
+                    current_job = job_result
+                
+                if isinstance(laser_result, BaseException):
+                    error_message = str(laser_result)
+                    laser_params = None
+                else:
+                    laser_params = laser_result
             
             return MachineStatus(
                 machine_url=self.url,
                 is_connected=self._connected,
                 current_job=current_job,
                 laser_parameters=laser_params,
-                last_update=datetime.now()
+                last_update=datetime.now(),
+                error_message=error_message
             )
         except Exception as e:
             return MachineStatus(
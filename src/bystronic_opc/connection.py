@@ -0,0 +1,143 @@
+"""Shared connection handling for Bystronic OPC UA clients."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Dict
+
+from .client import BystronicClient
+from .exceptions import ConnectionCooldownError, ConnectionError
+
+
+logger = logging.getLogger(__name__)
+
+
+class BystronicConnectionManager:
+    """Share one connected client per machine URL.
+    
+    After a failed connection attempt the URL is blocked for
+    ``failure_cooldown`` seconds, so callers fail fast instead of piling up
+    on a machine that is unreachable.
+    """
+    
+    def __init__(self, timeout: float = 10, failure_cooldown: float = 30):
+        """Initialize the connection manager.
+        
+        Args:
+            timeout: Connection timeout in seconds
+            failure_cooldown: Seconds to refuse connecting after a failure
+        """
+        self.timeout = timeout
+        self.failure_cooldown = failure_cooldown
+        self._clients: Dict[str, BystronicClient] = {}
+        self._last_failure: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    def get_client(self, url: str) -> BystronicClient:
+        """Get the client for a URL without connecting it.
+        
+        Args:
+            url: OPC UA server URL
+        
+        Returns:
+            Client instance shared by all users of this URL
+        """
+        client = self._clients.get(url)
+        if client is None:
+            client = BystronicClient(url, timeout=self.timeout)
+            self._clients[url] = client
+        return client
+    
+    async def connect(self, url: str) -> BystronicClient:
+        """Get a connected client for a URL.
+        
+        Args:
+            url: OPC UA server URL
+        
+        Returns:
+            Connected client instance
+        
+        Raises:
+            ConnectionError: If the connection fails
+            ConnectionCooldownError: If the URL is still blocked from a
+                recent failure
+        """
+        client = self.get_client(url)
+        self._check_cooldown(url)
+        
+        # Created on first use so the lock belongs to the running loop
+        lock = self._locks.get(url)
+        if lock is None:
+            lock = self._locks[url] = asyncio.Lock()
+        
+        async with lock:
+            if client._connected:
+                return client
+            
+            # A caller ahead of us in the queue may have just failed
+            self._check_cooldown(url)
+            
+            try:
+                await asyncio.wait_for(client.connect(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._last_failure[url] = time.monotonic()
+                # Drop the half-open transport so the next attempt starts clean
+                with suppress(Exception):
+                    client._client.disconnect_socket()
+                raise ConnectionError(f"Timed out connecting to {url}")
+            except Exception:
+                self._last_failure[url] = time.monotonic()
+                raise
+            
+            self._last_failure.pop(url, None)
+            logger.debug(f"Connected to {url}")
+            return client
+    
+    def _check_cooldown(self, url: str) -> None:
+        """Refuse to connect while a URL's recent failure is cooling down.
+        
+        Args:
+            url: OPC UA server URL
+        
+        Raises:
+            ConnectionCooldownError: If the last failure is within the cooldown
+        """
+        if self.cooldown_remaining(url) > 0:
+            raise ConnectionCooldownError(f"Connection to {url} recently failed, retry later")
+    
+    def cooldown_remaining(self, url: str) -> float:
+        """Get the time until a URL may be connected again.
+        
+        Args:
+            url: OPC UA server URL
+        
+        Returns:
+            Seconds left in the failure cooldown, 0 if none is active
+        """
+        last_failure = self._last_failure.get(url)
+        if last_failure is None:
+            return 0
+        return max(0, self.failure_cooldown - (time.monotonic() - last_failure))
+    
+    @asynccontextmanager
+    async def acquire(self, url: str) -> AsyncIterator[BystronicClient]:
+        """Use a connected client for a URL.
+        
+        The connection stays open after the block so it can be reused.
+        
+        Args:
+            url: OPC UA server URL
+        
+        Yields:
+            Connected client instance
+        """
+        yield await self.connect(url)
+    
+    async def close(self) -> None:
+        """Disconnect all managed clients."""
+        for client in self._clients.values():
+            try:
+                await client.disconnect()
+            except Exception as e:
+                logger.error(f"Error disconnecting client: {e}")
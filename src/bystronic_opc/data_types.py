@@ -1,13 +1,53 @@
 """Data type definitions for Bystronic OPC UA data structures."""
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional, Dict, Any
 from uuid import UUID
 
 
-@dataclass
-class JobInfo:
+# Instances are never modified after creation; slots need Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS["slots"] = True
+
+
+class _StringCache:
+    """Base for slots holding formatted strings outside the dataclass fields.
+    
+    Pickling and copying only carry the dataclass fields; the cached string
+    is rebuilt on first access. Without this, restoring the slot on Python
+    3.8/3.9 would go through the frozen ``__setattr__`` and fail. From 3.10
+    the slotted dataclass defines equivalent methods itself.
+    """
+    
+    __slots__ = ()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}  # type: ignore[arg-type]
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+class _GuidStrCache(_StringCache):
+    """Slot for JobInfo's formatted GUID, kept out of the dataclass fields."""
+    
+    __slots__ = ("_guid_str",)
+    _guid_str: str
+
+
+class _LastUpdateIsoCache(_StringCache):
+    """Slot for MachineStatus's formatted timestamp, kept out of the dataclass fields."""
+    
+    __slots__ = ("_last_update_iso",)
+    _last_update_iso: Optional[str]
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class JobInfo(_GuidStrCache):
     """Information about a cutting job."""
     
     guid: UUID
@@ -15,9 +55,22 @@ class JobInfo:
     file_path: str
     created_at: Optional[datetime] = None
     status: Optional[str] = None
+    
+    def __post_init__(self) -> None:
+        # Formatted once; the instance is immutable
+        object.__setattr__(self, "_guid_str", str(self.guid))
+    
+    @property
+    def guid_str(self) -> str:
+        """Job GUID as a string."""
+        try:
+            return self._guid_str
+        except AttributeError:  # copies restored without __init__, e.g. by pickle
+            self.__post_init__()
+            return self._guid_str
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PlanInfo:
     """Information about a cutting plan."""
     
@@ -34,7 +87,7 @@ class PlanInfo:
     parameter_file: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PartInfo:
     """Information about a part in a job."""
     
@@ -49,7 +102,7 @@ class PartInfo:
     user_info_2: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class RunInfo:
     """Information about a cutting run."""
     
@@ -62,7 +115,7 @@ class RunInfo:
     cut_end_time: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LaserParameters:
     """Current laser parameters."""
     
@@ -74,8 +127,8 @@ class LaserParameters:
     process_operation_mode: int
 
 
-@dataclass
-class MachineStatus:
+@dataclass(**_DATACLASS_OPTIONS)
+class MachineStatus(_LastUpdateIsoCache):
     """Overall machine status information."""
     
     machine_url: str
@@ -84,9 +137,26 @@ class MachineStatus:
     laser_parameters: Optional[LaserParameters] = None
     last_update: Optional[datetime] = None
     error_message: Optional[str] = None
+    
+    def __post_init__(self) -> None:
+        # Formatted once; the instance is immutable
+        object.__setattr__(
+            self,
+            "_last_update_iso",
+            self.last_update.isoformat() if self.last_update is not None else None
+        )
+    
+    @property
+    def last_update_iso(self) -> Optional[str]:
+        """Last update time in ISO 8601 format."""
+        try:
+            return self._last_update_iso
+        except AttributeError:  # copies restored without __init__, e.g. by pickle
+            self.__post_init__()
+            return self._last_update_iso
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class HistoryQuery:
     """Parameters for historical data queries."""
     
@@ -11,6 +11,11 @@ class ConnectionError(BystronicOPCError):
     pass
 
 
+class ConnectionCooldownError(ConnectionError):
+    """Raised when a connection is refused because a recent attempt failed."""
+    pass
+
+
 class DataError(BystronicOPCError):
     """Raised when data parsing or processing fails."""
     pass
@@ -1,17 +1,114 @@
 """Multi-machine monitoring implementation."""
 
 import asyncio
+import heapq
 import logging
+import random
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple, TypeVar
+
+from asyncua import Node, ua
 
 from .client import BystronicClient
-from .data_types import MachineStatus
-from .exceptions import ConnectionError
+from .connection import BystronicConnectionManager
+from .data_types import JobInfo, LaserParameters, MachineStatus
+from .exceptions import ConnectionCooldownError, ConnectionError, DataError
+
+
+_json_dumps: Callable[[Any], bytes]
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:  # pragma: no cover - fall back to the standard library
+    from json import dumps as _json_std_dumps
+    
+    def _json_dumps_std(obj: Any) -> bytes:
+        return _json_std_dumps(obj).encode("utf-8")
+    
+    _json_dumps = _json_dumps_std
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class _StatusSubscriptionHandler:
+    """Subscription handler building a machine status from pushed values."""
+    
+    def __init__(
+        self,
+        client: BystronicClient,
+        on_update: Callable[[MachineStatus], None],
+        on_lost: Optional[Callable[[str], None]] = None
+    ):
+        """Initialize the handler.
+        
+        Args:
+            client: Client whose status nodes are subscribed
+            on_update: Called with the new status after every change, once
+                all values have been received
+            on_lost: Called with an error message when the server reports
+                that the subscription stopped, e.g. because the session
+                was lost
+        """
+        self._client = client
+        self._on_update = on_update
+        self._on_lost = on_lost
+        self._keys = dict(zip(client.LASER_NODES, client.LASER_KEYS))
+        self._job_received = False
+        self.current_job: Optional[JobInfo] = None
+        self.values: Dict[str, Any] = {}
+    
+    def datachange_notification(self, node: Node, val: Any, data: Any) -> None:
+        """Apply the new value of a subscribed node."""
+        key = self._keys.get(node.nodeid.to_string())
+        if key is not None:
+            self.values[key] = val
+        elif node == self._client._current_job_node:
+            try:
+                self.current_job = self._client._decode_job_info(val)
+                self._job_received = True
+            except DataError as e:
+                logger.warning(f"Ignoring undecodable job from {self._client.url}: {e}")
+                return
+        else:
+            return
+        
+        if self.is_complete:
+            self._on_update(self.status)
+    
+    def status_change_notification(self, status: ua.StatusChangeNotification) -> None:
+        """Handle a change of the subscription's status."""
+        if status.Status.is_good():
+            return
+        
+        logger.warning(f"Status subscription of {self._client.url} stopped: {status.Status}")
+        if self._on_lost is not None:
+            self._on_lost(f"Subscription stopped: {status.Status}")
+    
+    @property
+    def is_complete(self) -> bool:
+        """Whether a value has been received for every subscribed node."""
+        return self._job_received and len(self.values) == len(self._keys)
+    
+    @property
+    def laser_parameters(self) -> LaserParameters:
+        """Latest laser parameters pushed by the server."""
+        return self._client._build_laser_parameters(self.values)
+    
+    @property
+    def status(self) -> MachineStatus:
+        """Machine status built from the latest pushed values."""
+        return MachineStatus(
+            machine_url=self._client.url,
+            is_connected=True,
+            current_job=self.current_job,
+            laser_parameters=self.laser_parameters,
+            last_update=datetime.now()
+        )
+
 
 class MachineMonitor:
     """Monitor multiple Bystronic machines simultaneously."""
@@ -20,7 +117,9 @@ class MachineMonitor:
         self,
         machines: Dict[str, str],
         update_interval: int = 30,
-        retry_attempts: int = 3
+        retry_attempts: int = 3,
+        connection_manager: Optional[BystronicConnectionManager] = None,
+        max_concurrency: int = 10
     ):
         """Initialize machine monitor.
         
@@ -28,22 +127,51 @@ class MachineMonitor:
             machines: Dictionary of machine name -> OPC UA URL
             update_interval: Update interval in seconds
             retry_attempts: Number of retry attempts for failed connections
+            connection_manager: Manager providing the machine clients. A
+                private one is created when omitted. A manager passed in
+                is not closed by stop_monitoring().
+            max_concurrency: Maximum number of machines polled at once
         """
         self.machines = machines
         self.update_interval = update_interval
         self.retry_attempts = retry_attempts
+        self.max_concurrency = max_concurrency
+        self._connections = connection_manager or BystronicConnectionManager()
+        # Clients of a shared manager stay connected for its other users
+        self._owns_connections = connection_manager is None
         self._clients: Dict[str, BystronicClient] = {}
         self._status: Dict[str, MachineStatus] = {}
+        self._status_json_cache: Tuple[int, bytes] = (-1, b'')
+        self._updates: Dict[str, Dict[str, Any]] = {}
+        self._connected: Set[str] = set()
+        self._disconnected: Set[str] = set(machines)
+        self._dirty: Set[str] = set()
+        self._change_event: Optional[asyncio.Event] = None
+        self._subscriptions: Dict[str, Any] = {}
+        self._subscribed_connection: Dict[str, int] = {}
+        self._status_handlers: Dict[str, _StatusSubscriptionHandler] = {}
         self._monitoring = False
         self._tasks: List[asyncio.Task] = []
+        self._schedule: List[Tuple[float, str]] = []
+        self._schedule_changed: Optional[asyncio.Event] = None
+        self._poll_semaphore: Optional[asyncio.Semaphore] = None
+        self._poll_tasks: Set[asyncio.Task] = set()
+        self._retry_counts: Dict[str, int] = {}
+        self._screen_cache: Dict[str, Tuple[float, bytes]] = {}
+        self._screen_locks: Dict[str, asyncio.Lock] = {}
         
         # Initialize clients
         for name, url in machines.items():
-            self._clients[name] = BystronicClient(url)
+            self._clients[name] = self._connections.get_client(url)
             self._status[name] = MachineStatus(
                 machine_url=url,
                 is_connected=False
             )
+        # (version, read-only copy of _status), replaced as one object so
+        # readers in other threads never pair a version with the wrong data
+        self._status_snapshot: Tuple[int, Mapping[str, MachineStatus]] = (
+            0, MappingProxyType(dict(self._status))
+        )
     
     async def start_monitoring(self) -> None:
         """Start monitoring all machines."""
@@ -54,10 +182,18 @@ class MachineMonitor:
         self._monitoring = True
         logger.info(f"Starting monitoring for {len(self.machines)} machines")
         
-        # Create monitoring tasks for each machine
-        for machine_name in self.machines:
-            task = asyncio.create_task(self._monitor_machine(machine_name))
-            self._tasks.append(task)
+        # Spread the first polls over one interval so the machines are not
+        # all queried at the same moment
+        now = asyncio.get_running_loop().time()
+        self._schedule = [
+            (now + random.uniform(0, self.update_interval), machine_name)
+            for machine_name in self.machines
+        ]
+        heapq.heapify(self._schedule)
+        self._schedule_changed = asyncio.Event()
+        self._poll_semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        self._tasks.append(asyncio.create_task(self._scheduler()))
         
         logger.info("Machine monitoring started")
     
@@ -69,96 +205,329 @@ class MachineMonitor:
         self._monitoring = False
         logger.info("Stopping machine monitoring")
         
-        # Cancel all monitoring tasks
-        for task in self._tasks:
+        # Cancel the scheduler and any polls in flight
+        tasks = self._tasks + list(self._poll_tasks)
+        for task in tasks:
             task.cancel()
         
         # Wait for tasks to complete
-        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await asyncio.gather(*tasks, return_exceptions=True)
         self._tasks.clear()
+        self._poll_tasks.clear()
+        self._schedule.clear()
         
-        # Disconnect all clients
-        for client in self._clients.values():
-            try:
-                await client.disconnect()
-            except Exception as e:
-                logger.error(f"Error disconnecting client: {e}")
+        # Remove status subscriptions
+        for machine_name in list(self._subscriptions):
+            await self._unsubscribe(machine_name)
+        
+        # Disconnect all clients, unless the manager is shared
+        if self._owns_connections:
+            await self._connections.close()
         
         logger.info("Machine monitoring stopped")
     
-    async def _monitor_machine(self, machine_name: str) -> None:
-        """Monitor a single machine continuously.
+    async def _scheduler(self) -> None:
+        """Start machine polls as they become due.
+        
+        Each machine has one entry in a heap of due times. The entry is put
+        back when the machine's poll finishes, so a machine is never polled
+        twice at once.
+        """
+        loop = asyncio.get_running_loop()
+        schedule_changed = self._schedule_changed
+        assert schedule_changed is not None, "created by start_monitoring()"
+        
+        while self._monitoring:
+            if not self._schedule:
+                await schedule_changed.wait()
+                schedule_changed.clear()
+                continue
+            
+            due, machine_name = self._schedule[0]
+            delay = due - loop.time()
+            if delay > 0:
+                # Wake early if a finished poll schedules an earlier machine
+                schedule_changed.clear()
+                try:
+                    await asyncio.wait_for(schedule_changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self._schedule)
+            task = asyncio.create_task(self._run_poll(machine_name))
+            self._poll_tasks.add(task)
+            task.add_done_callback(self._poll_tasks.discard)
+    
+    async def _run_poll(self, machine_name: str) -> None:
+        """Poll a machine and schedule its next poll.
         
         Args:
-            machine_name: Name of the machine to monitor
+            machine_name: Name of the machine to poll
+        """
+        semaphore = self._poll_semaphore
+        schedule_changed = self._schedule_changed
+        assert semaphore is not None, "created by start_monitoring()"
+        assert schedule_changed is not None, "created by start_monitoring()"
+        
+        async with semaphore:
+            delay = await self._poll_machine(machine_name)
+        
+        loop = asyncio.get_running_loop()
+        heapq.heappush(self._schedule, (loop.time() + delay, machine_name))
+        schedule_changed.set()
+    
+    async def _poll_machine(self, machine_name: str) -> float:
+        """Check a single machine once.
+        
+        Args:
+            machine_name: Name of the machine to check
+        
+        Returns:
+            Seconds to wait before checking the machine again
         """
         client = self._clients[machine_name]
-        retry_count = 0
         
-        while self._monitoring:
-            try:
-                # Ensure connection
-                if not client._connected:
-                    await client.connect()
-                    retry_count = 0
-                    logger.info(f"Connected to {machine_name}")
-                
-                # Get machine status
+        try:
+            # Ensure connection, re-establishing it if the server dropped it
+            if not client._connected:
+                await self._connections.connect(client.url)
+                self._retry_counts[machine_name] = 0
+                logger.info(f"Connected to {machine_name}")
+            else:
+                await client.ensure_connected()
+            
+            # Let the server push status changes where possible.
+            # Subscriptions die with their session, so renew them after
+            # every (re)connect.
+            if self._subscribed_connection.get(machine_name) != client.connection_id:
+                await self._subscribe(machine_name)
+            
+            # Poll only while no complete pushed status is available
+            handler = self._status_handlers.get(machine_name)
+            if handler is None or not handler.is_complete:
                 status = await client.get_machine_status()
-                self._status[machine_name] = status
-                
+                self._set_status(machine_name, status)
                 logger.debug(f"Updated status for {machine_name}")
-                
-                # Wait for next update
-                await asyncio.sleep(self.update_interval)
-                
-            except ConnectionError as e:
-                retry_count += 1
-                logger.error(f"Connection error for {machine_name}: {e}")
-                
-                if retry_count <= self.retry_attempts:
-                    wait_time = min(retry_count * 10, 60)  # Exponential backoff
-                    logger.info(f"Retrying {machine_name} in {wait_time} seconds")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"Max retries reached for {machine_name}")
-                    self._status[machine_name] = MachineStatus(
-                        machine_url=client.url,
-                        is_connected=False,
-                        error_message=str(e),
-                        last_update=datetime.now()
-                    )
-                    await asyncio.sleep(self.update_interval)
-                    retry_count = 0  # Reset for next attempt
             
-            except Exception as e:
-                logger.error(f"Unexpected error monitoring {machine_name}: {e}")
-                self._status[machine_name] = MachineStatus(
-                    machine_url=client.url,
-                    is_connected=False,
-                    error_message=str(e),
-                    last_update=datetime.now()
-                )
-                await asyncio.sleep(self.update_interval)
+            return self.update_interval
+        
+        except ConnectionCooldownError as e:
+            # No attempt was made, so this does not count as a retry
+            logger.debug(f"Waiting for connection cooldown of {machine_name}: {e}")
+            if machine_name in self._status_handlers:
+                self._mark_disconnected(machine_name, str(e))
+            return max(self._connections.cooldown_remaining(client.url), 1)
+        
+        except ConnectionError as e:
+            retry_count = self._retry_counts.get(machine_name, 0) + 1
+            self._retry_counts[machine_name] = retry_count
+            logger.error(f"Connection error for {machine_name}: {e}")
+            
+            # The pushed status is no longer being refreshed
+            if machine_name in self._status_handlers:
+                self._mark_disconnected(machine_name, str(e))
+            
+            if retry_count <= self.retry_attempts:
+                wait_time = min(retry_count * 10, 60)  # Exponential backoff
+                logger.info(f"Retrying {machine_name} in {wait_time} seconds")
+                return wait_time
+            
+            logger.error(f"Max retries reached for {machine_name}")
+            self._set_status(machine_name, MachineStatus(
+                machine_url=client.url,
+                is_connected=False,
+                error_message=str(e),
+                last_update=datetime.now()
+            ))
+            self._retry_counts[machine_name] = 0  # Reset for next attempt
+            return self.update_interval
+        
+        except Exception as e:
+            logger.error(f"Unexpected error monitoring {machine_name}: {e}")
+            self._set_status(machine_name, MachineStatus(
+                machine_url=client.url,
+                is_connected=False,
+                error_message=str(e),
+                last_update=datetime.now()
+            ))
+            return self.update_interval
+    
+    async def _subscribe(self, machine_name: str) -> None:
+        """Subscribe to status changes of a machine.
+        
+        Failures are logged and the machine falls back to polling until
+        it reconnects.
+        
+        Args:
+            machine_name: Name of the machine
+        """
+        client = self._clients[machine_name]
+        
+        def on_update(status: MachineStatus) -> None:
+            # Notifications are delivered on the event loop, so no locking is needed
+            if self._status_handlers.get(machine_name) is handler:
+                self._set_status(machine_name, status)
+        
+        def on_lost(error_message: str) -> None:
+            if self._status_handlers.get(machine_name) is handler:
+                self._mark_disconnected(machine_name, error_message)
+        
+        handler = _StatusSubscriptionHandler(client, on_update, on_lost)
+        self._status_handlers.pop(machine_name, None)
+        self._subscribed_connection[machine_name] = client.connection_id
+        
+        try:
+            self._subscriptions[machine_name] = await client.subscribe_status(handler)
+            self._status_handlers[machine_name] = handler
+            logger.info(f"Subscribed to status of {machine_name}")
+            
+            # Initial values may have arrived before the handler was registered
+            if handler.is_complete:
+                self._set_status(machine_name, handler.status)
+        except Exception as e:
+            self._subscriptions[machine_name] = None
+            logger.warning(f"Subscription failed for {machine_name}, polling instead: {e}")
+    
+    def _mark_disconnected(self, machine_name: str, error_message: str) -> None:
+        """Drop a machine's pushed status and record it as disconnected.
+        
+        Polling takes over until the machine is subscribed again.
+        
+        Args:
+            machine_name: Name of the machine
+            error_message: Reason for the disconnect
+        """
+        self._status_handlers.pop(machine_name, None)
+        self._set_status(machine_name, MachineStatus(
+            machine_url=self._clients[machine_name].url,
+            is_connected=False,
+            error_message=error_message,
+            last_update=datetime.now()
+        ))
+    
+    async def _unsubscribe(self, machine_name: str) -> None:
+        """Delete the status subscription of a machine.
+        
+        Args:
+            machine_name: Name of the machine
+        """
+        subscription = self._subscriptions.pop(machine_name, None)
+        self._status_handlers.pop(machine_name, None)
+        self._subscribed_connection.pop(machine_name, None)
+        if subscription is None:
+            return
+        
+        try:
+            await subscription.delete()
+        except Exception as e:
+            logger.error(f"Error deleting subscription for {machine_name}: {e}")
+    
+    def _set_status(self, machine_name: str, status: MachineStatus) -> None:
+        """Store a new status for a machine.
+        
+        Args:
+            machine_name: Name of the machine
+            status: New machine status
+        """
+        previous = self._status.get(machine_name)
+        self._status[machine_name] = status
+        self._status_snapshot = (
+            self._status_snapshot[0] + 1, MappingProxyType(dict(self._status))
+        )
+        if previous is None or previous.is_connected != status.is_connected:
+            if status.is_connected:
+                self._disconnected.discard(machine_name)
+                self._connected.add(machine_name)
+            else:
+                self._connected.discard(machine_name)
+                self._disconnected.add(machine_name)
+        # Built once here and shared by every broadcast of this status
+        self._updates[machine_name] = {
+            'machine_name': machine_name,
+            'is_connected': status.is_connected,
+            'current_job': status.current_job.name if status.current_job else None,
+            'timestamp': status.last_update_iso or datetime.now().isoformat()
+        }
+        self._dirty.add(machine_name)
+        if self._change_event is not None:
+            self._change_event.set()
+    
+    async def wait_for_changes(self) -> Set[str]:
+        """Wait until at least one machine status changes.
+        
+        Must be awaited on the event loop the monitor runs on.
+        
+        Returns:
+            Names of the machines whose status changed since the last call
+        """
+        # Created on first use so the event belongs to the running loop
+        if self._change_event is None:
+            self._change_event = asyncio.Event()
+        
+        if not self._dirty:
+            await self._change_event.wait()
+        self._change_event.clear()
+        
+        changed, self._dirty = self._dirty, set()
+        return changed
     
     def get_machine_status(self, machine_name: str) -> Optional[MachineStatus]:
         """Get status of a specific machine.
         
         Args:
             machine_name: Name of the machine
-            
+        
         Returns:
             Machine status or None if not found
         """
-        return self._status.get(machine_name)
+        # Same snapshot as get_all_machine_status, so both always agree
+        return self._status_snapshot[1].get(machine_name)
+    
+    def get_machine_update(self, machine_name: str) -> Optional[Dict[str, Any]]:
+        """Get the broadcast payload for a machine's latest status change.
+        
+        Args:
+            machine_name: Name of the machine
+        
+        Returns:
+            Update payload or None if the status has not changed yet
+        """
+        return self._updates.get(machine_name)
     
-    def get_all_machine_status(self) -> Dict[str, MachineStatus]:
+    def get_all_machine_status(self) -> Mapping[str, MachineStatus]:
         """Get status of all machines.
         
         Returns:
-            Dictionary of machine name -> status
+            Read-only mapping of machine name -> status. It is not updated
+            by later status changes.
         """
-        return self._status.copy()
+        return self._status_snapshot[1]
+    
+    def get_all_machine_status_json(self) -> bytes:
+        """Get a JSON summary of all machine statuses.
+        
+        The encoded summary is cached until a status changes.
+        
+        Returns:
+            UTF-8 encoded JSON object of machine name -> status summary
+        """
+        version, snapshot = self._status_snapshot
+        cached_version, payload = self._status_json_cache
+        if cached_version == version:
+            return payload
+        
+        payload = _json_dumps({
+            machine_name: {
+                'is_connected': status.is_connected,
+                'current_job': status.current_job.name if status.current_job else None,
+                'last_update': status.last_update_iso,
+                'error_message': status.error_message
+            }
+            for machine_name, status in snapshot.items()
+        })
+        self._status_json_cache = (version, payload)
+        return payload
     
     def get_connected_machines(self) -> List[str]:
         """Get list of currently connected machines.
@@ -166,10 +535,7 @@ class MachineMonitor:
         Returns:
             List of connected machine names
         """
-        return [
-            name for name, status in self._status.items()
-            if status.is_connected
-        ]
+        return list(self._connected)
     
     def get_disconnected_machines(self) -> List[str]:
         """Get list of currently disconnected machines.
@@ -177,22 +543,106 @@ class MachineMonitor:
         Returns:
             List of disconnected machine names
         """
-        return [
-            name for name, status in self._status.items()
-            if not status.is_connected
-        ]
+        return list(self._disconnected)
+    
+    @property
+    def connected_count(self) -> int:
+        """Number of currently connected machines."""
+        return len(self._connected)
+    
+    def cooldown_remaining(self, machine_name: str) -> float:
+        """Get the time until a machine may be connected again.
+        
+        Args:
+            machine_name: Name of the machine
+        
+        Returns:
+            Seconds left in the machine's connection failure cooldown, 0 if
+            none is active
+        """
+        return self._connections.cooldown_remaining(self._clients[machine_name].url)
     
     async def get_machine_client(self, machine_name: str) -> Optional[BystronicClient]:
         """Get client for a specific machine.
         
         Args:
             machine_name: Name of the machine
-            
+        
         Returns:
             Client instance or None if not found
         """
         return self._clients.get(machine_name)
     
+    async def run_on_client(
+        self,
+        machine_name: str,
+        coro_factory: Callable[[BystronicClient], Awaitable[T]]
+    ) -> T:
+        """Run an operation on a machine's monitoring client.
+        
+        The client is connected first if needed, so callers reuse the
+        monitor's session instead of opening their own.
+        
+        Args:
+            machine_name: Name of the machine
+            coro_factory: Called with the connected client, returns the
+                awaitable to run
+        
+        Returns:
+            Result of the awaitable
+        
+        Raises:
+            KeyError: If the machine is not monitored
+            ConnectionError: If the client cannot be connected
+        """
+        client = self._clients[machine_name]
+        if not client._connected:
+            await self._connections.connect(client.url)
+        else:
+            await client.ensure_connected()
+        
+        return await coro_factory(client)
+    
+    async def get_screen_image(self, machine_name: str, max_age: float = 2.0) -> bytes:
+        """Get a machine's screen image, shared between concurrent callers.
+        
+        Images newer than ``max_age`` seconds are served from memory, and
+        only one fetch per machine runs at a time.
+        
+        Args:
+            machine_name: Name of the machine
+            max_age: Maximum age in seconds of a cached image
+        
+        Returns:
+            Screen image as PNG bytes
+        
+        Raises:
+            KeyError: If the machine is not monitored
+        """
+        if machine_name not in self._clients:
+            raise KeyError(machine_name)
+        
+        cached = self._screen_cache.get(machine_name)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        
+        # Created on first use so the lock belongs to the running loop
+        lock = self._screen_locks.get(machine_name)
+        if lock is None:
+            lock = self._screen_locks[machine_name] = asyncio.Lock()
+        
+        async with lock:
+            # Another caller may have fetched the image while we waited
+            cached = self._screen_cache.get(machine_name)
+            if cached is not None and time.monotonic() - cached[0] < max_age:
+                return cached[1]
+            
+            image_data = await self.run_on_client(
+                machine_name, lambda client: client.get_screen_image()
+            )
+            self._screen_cache[machine_name] = (time.monotonic(), image_data)
+            return image_data
+    
     async def __aenter__(self):
         """Async context manager entry."""
         await self.start_monitoring()
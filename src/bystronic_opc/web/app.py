@@ -1,33 +1,47 @@
 """Flask application factory for Bystronic OPC web interface."""
 
 import asyncio
-import json
+import concurrent.futures
+import math
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Any, Coroutine, Dict, Optional, Tuple
 from uuid import UUID
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, flash
 from flask_socketio import SocketIO, emit
 import asyncio
 from threading import Thread
 
-from ..client import BystronicClient
 from ..monitor import MachineMonitor
 from ..exceptions import ConnectionError, DataError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to Flask's encoder
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional
+    uvloop = None  # type: ignore[assignment]
+
 
 def create_app(config: Optional[Dict] = None) -> Flask:
     """Create Flask application with configuration.
     
     Args:
         config: Optional configuration dictionary
-        
+    
     Returns:
         Configured Flask application
     """
     app = Flask(__name__)
     app.config.from_mapping(
         SECRET_KEY='dev-key-change-in-production',
+        # Request handlers block on the monitor's asyncio thread, which a
+        # greenlet server (eventlet/gevent) without monkey patching would
+        # stall, so threading is the default
+        SOCKETIO_ASYNC_MODE='threading',
         MACHINES={
             "Machine_1": "opc.tcp://192.168.100.101:56000",
             "Machine_2": "opc.tcp://192.168.100.102:56000", 
@@ -39,7 +53,11 @@ def create_app(config: Optional[Dict] = None) -> Flask:
         app.config.update(config)
     
     # Initialize SocketIO for real-time updates
-    socketio = SocketIO(app, cors_allowed_origins="*")
+    socketio = SocketIO(
+        app,
+        cors_allowed_origins="*",
+        async_mode=app.config['SOCKETIO_ASYNC_MODE']
+    )
     app.socketio = socketio
     
     # Initialize machine monitor
@@ -49,26 +67,85 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     )
     app.monitor = monitor
     
+    # Event loop shared by the monitor and request handlers
+    loop, loop_thread = start_event_loop()
+    app.extensions['bystronic_loop'] = loop
+    app.extensions['bystronic_loop_thread'] = loop_thread
+    
     # Register routes
-    register_routes(app)
-    register_api_routes(app) 
-    register_socketio_events(socketio, monitor)
+    register_routes(app, monitor)
+    register_api_routes(app, monitor)
+    register_socketio_events(socketio, monitor, loop)
     
     return app
 
 
-def register_routes(app: Flask) -> None:
+def start_event_loop() -> Tuple[asyncio.AbstractEventLoop, Thread]:
+    """Start an event loop running forever in a background thread.
+    
+    Returns:
+        The running event loop and the thread running it
+    """
+    # libuv-backed loop where available, same asyncio API
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    
+    def run_loop() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+    
+    loop_thread = Thread(target=run_loop, daemon=True)
+    loop_thread.start()
+    return loop, loop_thread
+
+
+def run_coroutine(app: Flask, coro: Coroutine[Any, Any, Any], timeout: float = 30) -> Any:
+    """Run a coroutine on the application's event loop and wait for it.
+    
+    Args:
+        app: Flask application created by create_app
+        coro: Coroutine to run
+        timeout: Seconds to wait for the result
+    
+    Returns:
+        Result of the coroutine
+    
+    Raises:
+        concurrent.futures.TimeoutError: If the coroutine did not finish in
+            time; it is cancelled on the loop
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, app.extensions['bystronic_loop'])
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        # Don't leave the abandoned request running on the shared loop
+        future.cancel()
+        raise
+
+
+def ojsonify(obj: Any) -> Response:
+    """Create a JSON response, encoding with orjson when it is installed.
+    
+    Args:
+        obj: Object to encode; dataclasses, UUIDs and datetimes are supported
+    
+    Returns:
+        Response with an application/json body
+    """
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+
+def register_routes(app: Flask, monitor: MachineMonitor) -> None:
     """Register main web routes."""
+    # Bound once instead of read from app.config on every request
+    machines = app.config['MACHINES']
     
     @app.route('/')
     def index():
         """Main dashboard page."""
-        machines = app.config['MACHINES']
-        machine_status = {}
-        
         # Get current status of all machines
-        if hasattr(app, 'monitor'):
-            machine_status = app.monitor.get_all_machine_status()
+        machine_status = monitor.get_all_machine_status()
         
         return render_template('dashboard.html', 
                              machines=machines,
@@ -77,15 +154,12 @@ def register_routes(app: Flask) -> None:
     @app.route('/machine/<machine_name>')
     def machine_detail(machine_name):
         """Detailed machine view."""
-        if machine_name not in app.config['MACHINES']:
+        if machine_name not in machines:
             flash(f'Machine {machine_name} not found', 'error')
             return redirect(url_for('index'))
         
-        machine_url = app.config['MACHINES'][machine_name]
-        status = None
-        
-        if hasattr(app, 'monitor'):
-            status = app.monitor.get_machine_status(machine_name)
+        machine_url = machines[machine_name]
+        status = monitor.get_machine_status(machine_name)
         
         return render_template('machine_detail.html',
                              machine_name=machine_name,
@@ -96,71 +170,69 @@ def register_routes(app: Flask) -> None:
     def history():
         """Historical data view."""
         return render_template('history.html',
-                             machines=app.config['MACHINES'])
+                             machines=machines)
     
     @app.route('/settings')
     def settings():
         """Settings and configuration page."""
         return render_template('settings.html',
-                             machines=app.config['MACHINES'])
+                             machines=machines)
 
 
-def register_api_routes(app: Flask) -> None:
+def register_api_routes(app: Flask, monitor: MachineMonitor) -> None:
     """Register API routes for AJAX calls."""
+    # Bound once instead of read from app.config on every request
+    machines = app.config['MACHINES']
+    
+    def machine_unavailable(machine_name: str, error: ConnectionError) -> Tuple[Response, int]:
+        """Build the 503 response for an unreachable or cooling down machine."""
+        response = ojsonify({'error': str(error)})
+        retry_after = monitor.cooldown_remaining(machine_name)
+        if retry_after > 0:
+            response.headers['Retry-After'] = str(math.ceil(retry_after))
+        return response, 503
     
     @app.route('/api/machine/<machine_name>/status')
     def api_machine_status(machine_name):
         """Get machine status via API."""
-        if machine_name not in app.config['MACHINES']:
-            return jsonify({'error': 'Machine not found'}), 404
+        if machine_name not in machines:
+            return ojsonify({'error': 'Machine not found'}), 404
         
-        status = None
-        if hasattr(app, 'monitor'):
-            status = app.monitor.get_machine_status(machine_name)
+        status = monitor.get_machine_status(machine_name)
         
         if status:
-            return jsonify({
+            return ojsonify({
                 'machine_name': machine_name,
                 'is_connected': status.is_connected,
                 'current_job': {
                     'name': status.current_job.name if status.current_job else None,
-                    'guid': str(status.current_job.guid) if status.current_job else None
+                    'guid': status.current_job.guid_str if status.current_job else None
                 } if status.current_job else None,
                 'laser_parameters': {
                     'current_power': status.laser_parameters.current_laser_power if status.laser_parameters else 0,
                     'gas_pressure': status.laser_parameters.gas_pressure if status.laser_parameters else 0,
                     'operation_mode': status.laser_parameters.process_operation_mode if status.laser_parameters else 0
                 } if status.laser_parameters else None,
-                'last_update': status.last_update.isoformat() if status.last_update else None,
+                'last_update': status.last_update_iso,
                 'error_message': status.error_message
             })
         
-        return jsonify({'error': 'Status not available'}), 503
+        return ojsonify({'error': 'Status not available'}), 503
     
     @app.route('/api/machines/status')
     def api_all_machines_status():
         """Get status of all machines."""
-        if not hasattr(app, 'monitor'):
-            return jsonify({'error': 'Monitor not available'}), 503
-        
-        all_status = app.monitor.get_all_machine_status()
-        result = {}
-        
-        for machine_name, status in all_status.items():
-            result[machine_name] = {
-                'is_connected': status.is_connected,
-                'current_job': status.current_job.name if status.current_job else None,
-                'last_update': status.last_update.isoformat() if status.last_update else None,
-                'error_message': status.error_message
-            }
-        
-        return jsonify(result)
+        # Pre-encoded by the monitor and only rebuilt when a status changes
+        return Response(
+            monitor.get_all_machine_status_json(),
+            mimetype='application/json'
+        )
     
     @app.route('/api/machine/<machine_name>/history')
     def api_machine_history(machine_name):
         """Get machine history via API."""
-        if machine_name not in app.config['MACHINES']:
-            return jsonify({'error': 'Machine not found'}), 404
+        if machine_name not in machines:
+            return ojsonify({'error': 'Machine not found'}), 404
         
         # Get query parameters
         days = request.args.get('days', 7, type=int)
@@ -172,21 +244,13 @@ def register_api_routes(app: Flask) -> None:
         start_time = end_time - timedelta(days=days)
         
         try:
-            # Get machine client and fetch history
-            machine_url = app.config['MACHINES'][machine_name]
-            
-            async def fetch_history():
-                async with BystronicClient(machine_url) as client:
-                    return await client.get_run_history(start_time, end_time, page, page_size)
-            
-            # Run async function in thread (simplified for demo)
-            # In production, consider using proper async handling
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            history = loop.run_until_complete(fetch_history())
-            loop.close()
+            # Reuse the monitor's connected client on the shared event loop
+            history = run_coroutine(app, monitor.run_on_client(
+                machine_name,
+                lambda client: client.get_run_history(start_time, end_time, page, page_size)
+            ))
             
-            return jsonify({
+            return ojsonify({
                 'machine_name': machine_name,
                 'history': history,
                 'query': {
@@ -196,37 +260,41 @@ def register_api_routes(app: Flask) -> None:
                     'page_size': page_size
                 }
             })
-            
+        
+        except concurrent.futures.TimeoutError:
+            return ojsonify({'error': f'Timed out reading history from {machine_name}'}), 504
+        except ConnectionError as e:
+            # Unreachable, or refused while its connection failure cools down
+            return machine_unavailable(machine_name, e)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return ojsonify({'error': str(e)}), 500
     
     @app.route('/api/machine/<machine_name>/screen')
     def api_machine_screen(machine_name):
         """Get machine screen image."""
-        if machine_name not in app.config['MACHINES']:
-            return jsonify({'error': 'Machine not found'}), 404
+        if machine_name not in machines:
+            return ojsonify({'error': 'Machine not found'}), 404
         
         try:
-            machine_url = app.config['MACHINES'][machine_name]
-            
-            async def get_screen():
-                async with BystronicClient(machine_url) as client:
-                    return await client.get_screen_image()
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            image_data = loop.run_until_complete(get_screen())
-            loop.close()
+            # Viewers refreshing at the same time share one fetch
+            image_data = run_coroutine(app, monitor.get_screen_image(machine_name))
             
             # Return image directly
-            from flask import Response
             return Response(image_data, mimetype='image/png')
-            
+        
+        except concurrent.futures.TimeoutError:
+            return ojsonify({'error': f'Timed out reading screen image from {machine_name}'}), 504
+        except ConnectionError as e:
+            return machine_unavailable(machine_name, e)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return ojsonify({'error': str(e)}), 500
 
 
-def register_socketio_events(socketio: SocketIO, monitor: MachineMonitor) -> None:
+def register_socketio_events(
+    socketio: SocketIO,
+    monitor: MachineMonitor,
+    loop: asyncio.AbstractEventLoop
+) -> None:
     """Register WebSocket events for real-time updates."""
     
     @socketio.on('connect')
@@ -250,62 +318,59 @@ def register_socketio_events(socketio: SocketIO, monitor: MachineMonitor) -> Non
             join_room(f'machine_{machine_name}')
             emit('subscribed', {'machine_name': machine_name})
     
-    def broadcast_updates():
-        """Broadcast machine status updates to connected clients."""
+    def has_subscribers(room: str) -> bool:
+        # The manager maps namespace -> room -> participants
+        return bool(socketio.server.manager.rooms.get('/', {}).get(room))
+    
+    async def broadcast_updates() -> None:
+        """Broadcast machine status changes to connected clients."""
+        last_connected_count = None
+        
         while True:
             try:
-                if monitor:
-                    all_status = monitor.get_all_machine_status()
-                    
-                    for machine_name, status in all_status.items():
-                        data = {
-                            'machine_name': machine_name,
-                            'is_connected': status.is_connected,
-                            'current_job': status.current_job.name if status.current_job else None,
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        
-                        # Broadcast to all clients subscribed to this machine
-                        socketio.emit('machine_update', data, room=f'machine_{machine_name}')
+                # Wait until the monitor records a status change
+                changed = await monitor.wait_for_changes()
+                
+                for machine_name in changed:
+                    # Skip machines nobody is watching
+                    room = f'machine_{machine_name}'
+                    if not has_subscribers(room):
+                        continue
                     
-                    # Broadcast summary to all clients
-                    connected_count = len([s for s in all_status.values() if s.is_connected])
+                    # Broadcast to all clients subscribed to this machine
+                    socketio.emit('machine_update', monitor.get_machine_update(machine_name), room=room)
+                
+                # Broadcast summary to all clients when it changed
+                connected_count = monitor.connected_count
+                if connected_count != last_connected_count:
+                    last_connected_count = connected_count
                     socketio.emit('summary_update', {
-                        'total_machines': len(all_status),
+                        'total_machines': len(monitor.machines),
                         'connected_machines': connected_count,
                         'timestamp': datetime.now().isoformat()
                     })
-                
+            
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 print(f"Error in broadcast_updates: {e}")
             
-            import time
-            time.sleep(10)  # Update every 10 seconds
+            # Collect further changes before the next broadcast
+            await asyncio.sleep(0.5)
     
-    # Start background thread for updates
-    update_thread = Thread(target=broadcast_updates)
-    update_thread.daemon = True
-    update_thread.start()
+    # Run the broadcaster on the shared event loop
+    asyncio.run_coroutine_threadsafe(broadcast_updates(), loop)
 
 
 def main():
     """Main function to run the web application."""
     app = create_app()
     
-    # Start monitoring in background
-    import threading
-    
-    def start_monitoring():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(app.monitor.start_monitoring())
-    
-    monitor_thread = threading.Thread(target=start_monitoring)
-    monitor_thread.daemon = True
-    monitor_thread.start()
+    # Start monitoring on the application's event loop
+    run_coroutine(app, app.monitor.start_monitoring())
     
-    # Run the app
-    app.socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    # Run the app; the reloader would start a second monitor and loop
+    app.socketio.run(app, host='0.0.0.0', port=5000, debug=True, use_reloader=False)
 
 
 if __name__ == '__main__':
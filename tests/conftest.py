@@ -1,32 +1,20 @@
 """Test configuration and fixtures."""
 
 import pytest
-import asyncio
-from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 from bystronic_opc.data_types import JobInfo, PlanInfo, PartInfo, MachineStatus
 
 
-@pytest.fixture
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
-@pytest.fixture
-def mock_opc_client():
-    """Mock OPC UA client for testing."""
-    client = Mock()
-    client.connect = AsyncMock()
-    client.disconnect = AsyncMock()
-    client.get_node = Mock()
-    return client
+def pytest_collection_modifyitems(items):
+    """Run all async tests on pytest-asyncio's session-scoped event loop."""
+    for item in items:
+        if item.get_closest_marker("asyncio") is not None:
+            # Prepended so it is closer than the tests' own asyncio marker
+            item.add_marker(pytest.mark.asyncio(loop_scope="session"), append=False)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_job_info():
     """Sample job information for testing."""
     return JobInfo(
@@ -36,7 +24,7 @@ def sample_job_info():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_plan_info():
     """Sample plan information for testing."""
     return PlanInfo(
@@ -53,7 +41,7 @@ def sample_plan_info():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_machine_status():
     """Sample machine status for testing."""
     return MachineStatus(
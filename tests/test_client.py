@@ -1,5 +1,8 @@
 """Tests for the Bystronic OPC UA client."""
 
+import asyncio
+import struct
+
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 from uuid import uuid4
@@ -74,6 +77,72 @@ class TestBystronicClient:
         # Should not raise an exception
         client._ensure_connected()
     
+    def test_node_cache(self, client):
+        """Test node objects are created once and then reused."""
+        with patch.object(client._client, 'get_node') as mock_get_node:
+            first = client._node("ns=2;s=Laser.GasChannel")
+            second = client._node("ns=2;s=Laser.GasChannel")
+            
+            assert first is second
+            mock_get_node.assert_called_once_with("ns=2;s=Laser.GasChannel")
+    
+    @pytest.mark.asyncio
+    async def test_ensure_connected_reconnects_lost_connection(self, client):
+        """Test a connection closed by the server is re-established."""
+        client._connected = True
+        client._client.uaclient.protocol = Mock(state="closed")
+        
+        async def connect():
+            client._client.uaclient.protocol = Mock(state="open")
+        
+        with patch.object(client._client, 'connect', new_callable=AsyncMock) as mock_connect:
+            with patch.object(client._client, 'disconnect', new_callable=AsyncMock):
+                mock_connect.side_effect = connect
+                
+                await client.ensure_connected()
+                
+                mock_connect.assert_called_once()
+                assert client._connected
+                assert client.connection_id == 1
+    
+    @pytest.mark.asyncio
+    async def test_ensure_connected_reconnect_failure(self, client):
+        """Test giving up after the configured reconnect attempts."""
+        client._connected = True
+        client.reconnect_attempts = 1
+        client._client.uaclient.protocol = Mock(state="closed")
+        
+        with patch.object(client._client, 'connect', new_callable=AsyncMock) as mock_connect:
+            with patch.object(client._client, 'disconnect', new_callable=AsyncMock):
+                mock_connect.side_effect = Exception("Connection refused")
+                
+                with pytest.raises(ConnectionError, match="Failed to reconnect"):
+                    await client.ensure_connected()
+                
+                assert not client._connected
+    
+    @pytest.mark.asyncio
+    async def test_ensure_connected_reconnect_timeout(self, client):
+        """Test a hanging reconnect is aborted after the timeout."""
+        client._connected = True
+        client.timeout = 0.01
+        client.reconnect_attempts = 1
+        client._client.uaclient.protocol = Mock(state="closed")
+        
+        async def hang():
+            await asyncio.sleep(1)
+        
+        with patch.object(client._client, 'connect', new_callable=AsyncMock) as mock_connect:
+            with patch.object(client._client, 'disconnect', new_callable=AsyncMock):
+                with patch.object(client._client, 'disconnect_socket') as mock_disconnect_socket:
+                    mock_connect.side_effect = hang
+                    
+                    with pytest.raises(ConnectionError, match="Failed to reconnect"):
+                        await client.ensure_connected()
+                    
+                    mock_disconnect_socket.assert_called_once()
+                    assert not client._connected
+    
     def test_decode_job_info_valid_data(self, client):
         """Test decoding valid job info."""
         # Mock extension object with sample binary data
@@ -85,6 +154,62 @@ class TestBystronicClient:
         result = client._decode_job_info(None)
         assert result is None
     
+    def test_decode_job_info_binary(self, client):
+        """Test decoding job info from its binary layout."""
+        guid = uuid4()
+        name = "Test Job".encode("utf-8")
+        file_path = "/programs/test_job.job".encode("utf-8")
+        
+        mock_ext_obj = Mock()
+        mock_ext_obj.Body = (
+            guid.bytes_le + b'\x00' * 16
+            + struct.pack("<I", len(name)) + name
+            + struct.pack("<I", len(file_path)) + file_path
+        )
+        
+        result = client._decode_job_info(mock_ext_obj)
+        assert result.guid == guid
+        assert result.name == "Test Job"
+        assert result.file_path == "/programs/test_job.job"
+    
+    def test_decode_plan_info_binary(self, client):
+        """Test decoding plan info from its binary layout."""
+        job_guid = uuid4()
+        plan_guid = uuid4()
+        name = "Test Plan".encode("utf-8")
+        
+        mock_ext_obj = Mock()
+        mock_ext_obj.Body = (
+            job_guid.bytes_le + plan_guid.bytes_le
+            + struct.pack("<I", len(name)) + name
+            + struct.pack("<dddiiid", 1500.0, 3000.0, 3.0, 5, 50, 1, 1800.0)
+        )
+        
+        result = client._decode_plan_info(mock_ext_obj)
+        assert result.job_guid == job_guid
+        assert result.plan_guid == plan_guid
+        assert result.name == "Test Plan"
+        assert result.size_x == 1500.0
+        assert result.material_thickness == 3.0
+        assert result.total_parts == 50
+        assert result.plan_state == 1
+        assert result.estimated_cut_time == 1800.0
+    
+    def test_decode_job_info_guid_layout(self, client):
+        """Test GUIDs use little-endian fields followed by 8 raw bytes."""
+        name = b"Job"
+        
+        mock_ext_obj = Mock()
+        mock_ext_obj.Body = (
+            struct.pack("<IHH8s", 0x01020304, 0x0506, 0x0708, bytes(range(9, 17)))
+            + b'\x00' * 16
+            + struct.pack("<I", len(name)) + name
+            + struct.pack("<I", 0)
+        )
+        
+        result = client._decode_job_info(mock_ext_obj)
+        assert str(result.guid) == "01020304-0506-0708-090a-0b0c0d0e0f10"
+    
     def test_decode_job_info_invalid_data(self, client):
         """Test decoding invalid job info."""
         mock_ext_obj = Mock()
@@ -125,6 +250,70 @@ class TestBystronicClient:
             assert result.current_laser_power == 100.0
             assert result.gas_channel == 100.0  # All values will be 100.0 in this mock
     
+    @pytest.mark.asyncio
+    async def test_get_laser_parameters_batched(self, client):
+        """Test laser parameters are read in a single batched request."""
+        client._connected = True
+        
+        with patch.object(client._client, 'read_values', new_callable=AsyncMock) as mock_read:
+            mock_read.return_value = [1500.0, 2, 0.8, 1.5, 1600.0, 1]
+            
+            result = await client.get_laser_parameters()
+            
+            mock_read.assert_called_once()
+            assert result.current_laser_power == 1500.0
+            assert result.gas_channel == 2
+            assert result.process_operation_mode == 1
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_laser(self, client):
+        """Test subscribing to laser parameter changes."""
+        client._connected = True
+        handler = Mock()
+        
+        with patch.object(client._client, 'create_subscription', new_callable=AsyncMock) as mock_create:
+            mock_subscription = Mock()
+            mock_subscription.subscribe_data_change = AsyncMock()
+            mock_create.return_value = mock_subscription
+            
+            subscription = await client.subscribe_laser(handler, interval_ms=250)
+            
+            assert subscription is mock_subscription
+            mock_create.assert_called_once_with(250, handler)
+            nodes = mock_subscription.subscribe_data_change.call_args[0][0]
+            assert len(nodes) == len(client.LASER_NODES)
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_status(self, client):
+        """Test subscribing to current job and laser parameter changes."""
+        client._connected = True
+        handler = Mock()
+        job_node = Mock()
+        
+        with patch.object(client, '_get_current_job_node', new_callable=AsyncMock) as mock_job_node:
+            with patch.object(client._client, 'create_subscription', new_callable=AsyncMock) as mock_create:
+                mock_job_node.return_value = job_node
+                mock_subscription = Mock()
+                mock_subscription.subscribe_data_change = AsyncMock()
+                mock_create.return_value = mock_subscription
+                
+                await client.subscribe_status(handler)
+                
+                nodes = mock_subscription.subscribe_data_change.call_args[0][0]
+                assert nodes[0] is job_node
+                assert len(nodes) == len(client.LASER_NODES) + 1
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_laser_failure(self, client):
+        """Test subscription failure raises DataError."""
+        client._connected = True
+        
+        with patch.object(client._client, 'create_subscription', new_callable=AsyncMock) as mock_create:
+            mock_create.side_effect = Exception("Not supported")
+            
+            with pytest.raises(DataError, match="Failed to subscribe"):
+                await client.subscribe_laser(Mock())
+    
     @pytest.mark.asyncio
     async def test_get_run_history(self, client):
         """Test getting run history."""
@@ -143,6 +332,46 @@ class TestBystronicClient:
             
             mock_call.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_iter_run_history(self, client):
+        """Test iterating run history across pages."""
+        from datetime import datetime
+        
+        pages = {
+            1: [{'RunGuid': '1'}, {'RunGuid': '2'}],
+            2: [{'RunGuid': '3'}, {'RunGuid': '4'}],
+            3: [{'RunGuid': '5'}],
+        }
+        
+        async def get_page(from_timestamp, to_timestamp, page, page_size):
+            return pages.get(page, [])
+        
+        with patch.object(client, 'get_run_history', side_effect=get_page) as mock_get:
+            start_time = datetime.now()
+            end_time = datetime.now()
+            
+            runs = [run async for run in client.iter_run_history(start_time, end_time, page_size=2)]
+            
+            assert [run['RunGuid'] for run in runs] == ['1', '2', '3', '4', '5']
+            assert mock_get.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_get_screen_picture(self, client):
+        """Test screen image is decoded into an RGB image."""
+        import io
+        from PIL import Image
+        
+        buffer = io.BytesIO()
+        Image.new("L", (4, 3)).save(buffer, format="PNG")
+        
+        with patch.object(client, 'get_screen_image', new_callable=AsyncMock) as mock_screen:
+            mock_screen.return_value = buffer.getvalue()
+            
+            image = await client.get_screen_picture()
+            
+            assert image.size == (4, 3)
+            assert image.mode == "RGB"
+    
     @pytest.mark.asyncio
     async def test_get_machine_status_success(self, client):
         """Test getting machine status successfully."""
@@ -159,6 +388,41 @@ class TestBystronicClient:
                 assert status.is_connected == client._connected
                 assert status.last_update is not None
     
+    @pytest.mark.asyncio
+    async def test_get_machine_status_single_read(self, client):
+        """Test current job and laser parameters are read in one request."""
+        client._connected = True
+        
+        with patch.object(client, '_get_current_job_node', new_callable=AsyncMock):
+            with patch.object(client._client, 'read_values', new_callable=AsyncMock) as mock_read:
+                mock_read.return_value = [None, 1500.0, 2, 0.8, 1.5, 1600.0, 1]
+                
+                status = await client.get_machine_status()
+                
+                mock_read.assert_called_once()
+                assert len(mock_read.call_args[0][0]) == len(client.LASER_NODES) + 1
+                assert status.is_connected
+                assert status.current_job is None
+                assert status.laser_parameters.current_laser_power == 1500.0
+    
+    @pytest.mark.asyncio
+    async def test_get_machine_status_partial(self, client):
+        """Test a failed laser read still returns the current job."""
+        client._connected = True
+        
+        with patch.object(client, '_read_status_values', new_callable=AsyncMock) as mock_read:
+            with patch.object(client, 'get_current_job', new_callable=AsyncMock) as mock_job:
+                with patch.object(client, 'get_laser_parameters', new_callable=AsyncMock) as mock_laser:
+                    mock_read.side_effect = Exception("Batch read failed")
+                    mock_job.return_value = None
+                    mock_laser.side_effect = DataError("Laser read failed")
+                    
+                    status = await client.get_machine_status()
+                    
+                    assert status.is_connected
+                    assert status.laser_parameters is None
+                    assert status.error_message == "Laser read failed"
+    
     @pytest.mark.asyncio
     async def test_get_machine_status_error(self, client):
         """Test getting machine status with error."""
@@ -0,0 +1,118 @@
+"""Tests for the shared connection manager."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from bystronic_opc.connection import BystronicConnectionManager
+from bystronic_opc.exceptions import ConnectionCooldownError, ConnectionError
+
+
+URL = "opc.tcp://test.machine:56000"
+
+
+class TestBystronicConnectionManager:
+    """Test suite for BystronicConnectionManager."""
+    
+    @pytest.fixture
+    def manager(self):
+        """Create a test connection manager."""
+        return BystronicConnectionManager(timeout=1, failure_cooldown=30)
+    
+    def test_get_client_shared(self, manager):
+        """Test the same client is returned for a URL."""
+        assert manager.get_client(URL) is manager.get_client(URL)
+    
+    def test_get_client_keeps_subsecond_timeout(self):
+        """Test a sub-second timeout reaches the client unchanged."""
+        manager = BystronicConnectionManager(timeout=0.5)
+        
+        assert manager.get_client(URL).timeout == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_acquire_connects_once(self, manager):
+        """Test acquire connects the client and reuses the connection."""
+        client = manager.get_client(URL)
+        
+        async def connect():
+            client._connected = True
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect:
+            mock_connect.side_effect = connect
+            
+            async with manager.acquire(URL) as acquired:
+                assert acquired is client
+            async with manager.acquire(URL):
+                pass
+            
+            mock_connect.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_failure_opens_circuit(self, manager):
+        """Test a failed connect blocks further attempts during the cooldown."""
+        client = manager.get_client(URL)
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect:
+            mock_connect.side_effect = ConnectionError("Connection failed")
+            
+            with pytest.raises(ConnectionError, match="Connection failed"):
+                await manager.connect(URL)
+            with pytest.raises(ConnectionCooldownError, match="recently failed"):
+                await manager.connect(URL)
+            
+            mock_connect.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_connect_timeout(self, manager):
+        """Test a hanging connect is aborted after the timeout."""
+        client = manager.get_client(URL)
+        manager.timeout = 0.01
+        
+        async def hang():
+            await asyncio.sleep(1)
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect:
+            mock_connect.side_effect = hang
+            
+            with pytest.raises(ConnectionError, match="Timed out"):
+                await manager.connect(URL)
+    
+    @pytest.mark.asyncio
+    async def test_connect_timeout_closes_socket(self, manager):
+        """Test the half-open connection is torn down after a timeout."""
+        client = manager.get_client(URL)
+        manager.timeout = 0.01
+        
+        async def hang():
+            await asyncio.sleep(1)
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect, \
+                patch.object(client._client, 'disconnect_socket') as mock_disconnect:
+            mock_connect.side_effect = hang
+            
+            with pytest.raises(ConnectionError, match="Timed out"):
+                await manager.connect(URL)
+            
+            mock_disconnect.assert_called_once()
+            assert not client._connected
+    
+    @pytest.mark.asyncio
+    async def test_queued_callers_respect_circuit(self, manager):
+        """Test callers waiting on the lock do not retry a failed connect."""
+        client = manager.get_client(URL)
+        
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("Connection failed")
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect:
+            mock_connect.side_effect = fail
+            
+            results = await asyncio.gather(
+                *[manager.connect(URL) for _ in range(5)],
+                return_exceptions=True
+            )
+            
+            mock_connect.assert_called_once()
+            assert all(isinstance(result, ConnectionError) for result in results)
@@ -0,0 +1,74 @@
+"""Tests for the data type definitions."""
+
+import copy
+import dataclasses
+import pickle
+from datetime import datetime
+
+import pytest
+from uuid import uuid4
+
+from bystronic_opc.data_types import JobInfo, MachineStatus
+
+
+class TestDataTypes:
+    """Test cases for the data types."""
+    
+    def test_machine_status_is_immutable(self):
+        """Test status fields cannot be changed after creation."""
+        status = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        )
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            status.is_connected = False
+    
+    def test_replace_creates_new_instance(self):
+        """Test dataclasses.replace is the way to derive a changed value."""
+        job = JobInfo(guid=uuid4(), name="Test_Job", file_path="C:\\Jobs\\Test_Job")
+        renamed = dataclasses.replace(job, name="Other_Job")
+        
+        assert renamed.name == "Other_Job"
+        assert job.name == "Test_Job"
+        assert renamed.guid == job.guid
+    
+    def test_cached_strings(self):
+        """Test GUID and timestamp strings are formatted at construction."""
+        job = JobInfo(guid=uuid4(), name="Test_Job", file_path="C:\\Jobs\\Test_Job")
+        assert job.guid_str == str(job.guid)
+        assert dataclasses.replace(job, guid=uuid4()).guid_str != job.guid_str
+        
+        now = datetime.now()
+        status = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True,
+            last_update=now
+        )
+        assert status.last_update_iso == now.isoformat()
+        assert MachineStatus(machine_url="", is_connected=False).last_update_iso is None
+    
+    def test_cached_strings_not_fields(self):
+        """Test the cached strings do not change the dataclass shape."""
+        job = JobInfo(guid=uuid4(), name="Test_Job", file_path="C:\\Jobs\\Test_Job")
+        
+        assert [f.name for f in dataclasses.fields(job)] == [
+            "guid", "name", "file_path", "created_at", "status"
+        ]
+        assert "_guid_str" not in dataclasses.asdict(job)
+        assert pickle.loads(pickle.dumps(job)).guid_str == job.guid_str
+    
+    def test_copies_keep_cached_strings(self):
+        """Test copies and pickles of frozen types rebuild their caches."""
+        job = JobInfo(guid=uuid4(), name="Test_Job", file_path="C:\\Jobs\\Test_Job")
+        status = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True,
+            current_job=job,
+            last_update=datetime.now()
+        )
+        
+        for restored in (copy.copy(status), copy.deepcopy(status), pickle.loads(pickle.dumps(status))):
+            assert restored == status
+            assert restored.last_update_iso == status.last_update_iso
+            assert restored.current_job.guid_str == job.guid_str
@@ -0,0 +1,336 @@
+"""Tests for the multi-machine monitor."""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from asyncua import ua
+
+from bystronic_opc.connection import BystronicConnectionManager
+from bystronic_opc.data_types import MachineStatus
+from bystronic_opc.exceptions import ConnectionError
+from bystronic_opc.monitor import MachineMonitor, _StatusSubscriptionHandler
+
+
+class TestMachineMonitor:
+    """Test suite for MachineMonitor."""
+    
+    @pytest.fixture
+    def monitor(self, machine_config):
+        """Create a test monitor instance."""
+        return MachineMonitor(machine_config, update_interval=1)
+    
+    def test_monitor_initialization(self, monitor, machine_config):
+        """Test monitor initialization."""
+        assert set(monitor.get_disconnected_machines()) == set(machine_config)
+        assert monitor.get_connected_machines() == []
+    
+    @pytest.mark.asyncio
+    async def test_cooldown_remaining(self, monitor):
+        """Test a machine's cooldown is read from its connection manager."""
+        client = monitor._clients["Test_Machine_1"]
+        
+        assert monitor.cooldown_remaining("Test_Machine_1") == 0
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect:
+            mock_connect.side_effect = ConnectionError("Connection failed")
+            with pytest.raises(ConnectionError):
+                await monitor.run_on_client("Test_Machine_1", AsyncMock())
+        
+        assert monitor.cooldown_remaining("Test_Machine_1") > 0
+        assert monitor.cooldown_remaining("Test_Machine_2") == 0
+    
+    def test_machine_status_from_snapshot(self, monitor):
+        """Test single and all-machine status are read from the same snapshot."""
+        status = MachineStatus(machine_url="opc.tcp://192.168.1.101:56000", is_connected=True)
+        monitor._set_status("Test_Machine_1", status)
+        # A status stored without being published must not be visible
+        monitor._status["Test_Machine_1"] = MachineStatus(machine_url="unpublished", is_connected=False)
+        
+        assert monitor.get_machine_status("Test_Machine_1") is status
+        assert monitor.get_all_machine_status()["Test_Machine_1"] is status
+    
+    def test_status_subscription_handler(self, monitor):
+        """Test the handler builds a status once all values were pushed."""
+        client = monitor._clients["Test_Machine_1"]
+        client._current_job_node = client._node("ns=2;i=5001")
+        updates = []
+        handler = _StatusSubscriptionHandler(client, updates.append)
+        
+        values = [1500.0, 2, 0.8, 1.5, 1600.0, 1]
+        for node_id, value in zip(client.LASER_NODES, values):
+            node = Mock()
+            node.nodeid = ua.NodeId.from_string(node_id)
+            handler.datachange_notification(node, value, None)
+        
+        assert not handler.is_complete
+        assert updates == []
+        
+        handler.datachange_notification(client._current_job_node, None, None)
+        
+        assert handler.is_complete
+        status = updates[-1]
+        assert status.is_connected
+        assert status.current_job is None
+        assert status.laser_parameters.current_laser_power == 1500.0
+        assert status.laser_parameters.gas_channel == 2
+        assert status.laser_parameters.laser_power_setpoint == 1600.0
+    
+    @pytest.mark.asyncio
+    async def test_connection_loss_drops_pushed_status(self, monitor):
+        """Test a lost connection is reported before the retries run out."""
+        client = monitor._clients["Test_Machine_1"]
+        client._connected = True
+        handler = Mock(is_complete=True)
+        monitor._status_handlers["Test_Machine_1"] = handler
+        monitor._set_status("Test_Machine_1", MachineStatus(
+            machine_url=client.url,
+            is_connected=True
+        ))
+        
+        with patch.object(client, 'ensure_connected', new_callable=AsyncMock) as mock_ensure:
+            mock_ensure.side_effect = ConnectionError("Server gone")
+            
+            await monitor._poll_machine("Test_Machine_1")
+        
+        status = monitor.get_machine_status("Test_Machine_1")
+        assert not status.is_connected
+        assert status.error_message == "Server gone"
+        assert "Test_Machine_1" not in monitor._status_handlers
+    
+    @pytest.mark.asyncio
+    async def test_subscription_status_change_marks_offline(self, monitor):
+        """Test a stopped subscription marks the machine disconnected."""
+        client = monitor._clients["Test_Machine_1"]
+        
+        with patch.object(client, 'subscribe_status', new_callable=AsyncMock):
+            await monitor._subscribe("Test_Machine_1")
+        handler = monitor._status_handlers["Test_Machine_1"]
+        
+        handler.status_change_notification(
+            ua.StatusChangeNotification(Status=ua.StatusCode(ua.StatusCodes.Good))
+        )
+        assert "Test_Machine_1" in monitor._status_handlers
+        
+        handler.status_change_notification(
+            ua.StatusChangeNotification(Status=ua.StatusCode(ua.StatusCodes.BadTimeout))
+        )
+        assert "Test_Machine_1" not in monitor._status_handlers
+        assert not monitor.get_machine_status("Test_Machine_1").is_connected
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_failure_falls_back_to_polling(self, monitor):
+        """Test a failed subscription is remembered so polling is used."""
+        client = monitor._clients["Test_Machine_1"]
+        
+        with patch.object(client, 'subscribe_status', new_callable=AsyncMock) as mock_subscribe:
+            mock_subscribe.side_effect = Exception("Not supported")
+            
+            await monitor._subscribe("Test_Machine_1")
+            
+            assert "Test_Machine_1" in monitor._subscriptions
+            assert "Test_Machine_1" not in monitor._status_handlers
+    
+    def test_all_machine_status_json_cached(self, monitor):
+        """Test the JSON summary is reused until a status changes."""
+        first = monitor.get_all_machine_status_json()
+        assert monitor.get_all_machine_status_json() is first
+        assert json.loads(first)["Test_Machine_1"]["is_connected"] is False
+        
+        monitor._set_status("Test_Machine_1", MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        ))
+        
+        second = monitor.get_all_machine_status_json()
+        assert second is not first
+        assert json.loads(second)["Test_Machine_1"]["is_connected"] is True
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_changes(self, monitor):
+        """Test changed machines are reported once per wait."""
+        status = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        )
+        
+        waiter = asyncio.ensure_future(monitor.wait_for_changes())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        monitor._set_status("Test_Machine_1", status)
+        monitor._set_status("Test_Machine_1", status)
+        
+        assert await asyncio.wait_for(waiter, timeout=1) == {"Test_Machine_1"}
+        assert monitor._dirty == set()
+    
+    def test_machine_update_payload(self, monitor):
+        """Test the broadcast payload is built when the status is stored."""
+        assert monitor.get_machine_update("Test_Machine_1") is None
+        
+        status = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        )
+        monitor._set_status("Test_Machine_1", status)
+        
+        update = monitor.get_machine_update("Test_Machine_1")
+        assert update['machine_name'] == "Test_Machine_1"
+        assert update['is_connected'] is True
+        assert update['current_job'] is None
+        assert update['timestamp']
+        assert monitor.get_machine_update("Test_Machine_1") is update
+        
+        stamped = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True,
+            last_update=datetime(2024, 1, 2, 3, 4, 5)
+        )
+        monitor._set_status("Test_Machine_1", stamped)
+        assert monitor.get_machine_update("Test_Machine_1")['timestamp'] == stamped.last_update_iso
+    
+    def test_connected_sets_follow_status(self, monitor):
+        """Test connected/disconnected lists track status changes."""
+        connected = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        )
+        disconnected = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=False
+        )
+        
+        monitor._set_status("Test_Machine_1", connected)
+        assert monitor.get_connected_machines() == ["Test_Machine_1"]
+        assert "Test_Machine_1" not in monitor.get_disconnected_machines()
+        assert monitor.connected_count == 1
+        
+        monitor._set_status("Test_Machine_1", disconnected)
+        assert monitor.get_connected_machines() == []
+        assert "Test_Machine_1" in monitor.get_disconnected_machines()
+        assert monitor.connected_count == 0
+    
+    @pytest.mark.asyncio
+    async def test_scheduler_polls_each_machine(self, machine_config):
+        """Test the scheduler polls every machine within the concurrency limit."""
+        monitor = MachineMonitor(machine_config, update_interval=0.05, max_concurrency=1)
+        polled = []
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def poll(machine_name):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            polled.append(machine_name)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return monitor.update_interval
+        
+        with patch.object(monitor, '_poll_machine', side_effect=poll):
+            await monitor.start_monitoring()
+            await asyncio.sleep(0.3)
+            await monitor.stop_monitoring()
+        
+        assert set(polled) == set(machine_config)
+        assert polled.count("Test_Machine_1") > 1
+        assert max_in_flight == 1
+    
+    @pytest.mark.asyncio
+    async def test_screen_image_shared_fetch(self, monitor):
+        """Test concurrent screen requests trigger a single fetch."""
+        client = monitor._clients["Test_Machine_1"]
+        client._connected = True
+        
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return b"png"
+        
+        with patch.object(client, 'ensure_connected', new_callable=AsyncMock):
+            with patch.object(client, 'get_screen_image', side_effect=fetch) as mock_fetch:
+                images = await asyncio.gather(*[
+                    monitor.get_screen_image("Test_Machine_1") for _ in range(5)
+                ])
+                assert images == [b"png"] * 5
+                assert mock_fetch.call_count == 1
+                
+                await monitor.get_screen_image("Test_Machine_1", max_age=0)
+                assert mock_fetch.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_run_on_client_connects_first(self, monitor):
+        """Test operations run on the monitor's client after connecting it."""
+        client = monitor._clients["Test_Machine_1"]
+        
+        with patch.object(monitor._connections, 'connect', new_callable=AsyncMock) as mock_connect:
+            result = await monitor.run_on_client(
+                "Test_Machine_1", AsyncMock(return_value=[{'RunGuid': 'abc'}])
+            )
+            
+            mock_connect.assert_called_once_with(client.url)
+            assert result == [{'RunGuid': 'abc'}]
+    
+    def test_all_machine_status_snapshot(self, monitor):
+        """Test the status snapshot is read-only and replaced on change."""
+        snapshot = monitor.get_all_machine_status()
+        assert monitor.get_all_machine_status() is snapshot
+        
+        with pytest.raises(TypeError):
+            snapshot["Test_Machine_1"] = None
+        
+        status = MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        )
+        monitor._set_status("Test_Machine_1", status)
+        
+        assert monitor.get_all_machine_status()["Test_Machine_1"] is status
+        assert snapshot["Test_Machine_1"] is not status
+    
+    def test_all_machine_status_json_matches_version(self, monitor):
+        """Test the cached JSON is always encoded from its own snapshot."""
+        monitor.get_all_machine_status_json()
+        monitor._set_status("Test_Machine_1", MachineStatus(
+            machine_url="opc.tcp://192.168.1.101:56000",
+            is_connected=True
+        ))
+        
+        version, payload = monitor._status_json_cache
+        assert version != monitor._status_snapshot[0]
+        payload = monitor.get_all_machine_status_json()
+        
+        assert monitor._status_json_cache[0] == monitor._status_snapshot[0]
+        assert json.loads(payload)["Test_Machine_1"]["is_connected"] is True
+    
+    @pytest.mark.asyncio
+    async def test_stop_keeps_shared_manager_connected(self, machine_config):
+        """Test stopping a monitor leaves a shared manager's clients alone."""
+        manager = BystronicConnectionManager()
+        monitor = MachineMonitor(machine_config, connection_manager=manager)
+        
+        with patch.object(manager, 'close', new_callable=AsyncMock) as mock_close:
+            await monitor.start_monitoring()
+            await monitor.stop_monitoring()
+            
+            mock_close.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_cooldown_refusal_not_counted_as_retry(self, monitor):
+        """Test polls refused by the connection cooldown keep the retry count."""
+        client = monitor._clients["Test_Machine_1"]
+        
+        with patch.object(client, 'connect', new_callable=AsyncMock) as mock_connect:
+            mock_connect.side_effect = ConnectionError("Connection failed")
+            
+            await monitor._poll_machine("Test_Machine_1")
+            assert monitor._retry_counts["Test_Machine_1"] == 1
+            
+            for _ in range(monitor.retry_attempts + 1):
+                delay = await monitor._poll_machine("Test_Machine_1")
+            
+            mock_connect.assert_called_once()
+            assert monitor._retry_counts["Test_Machine_1"] == 1
+            assert 0 < delay <= monitor._connections.failure_cooldown
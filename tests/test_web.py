@@ -0,0 +1,279 @@
+"""Tests for the Flask web interface."""
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from bystronic_opc.exceptions import ConnectionCooldownError, ConnectionError
+from bystronic_opc.web.app import create_app, ojsonify, run_coroutine, start_event_loop
+
+
+MACHINES = {
+    "Machine_1": "opc.tcp://192.168.1.101:56000",
+    "Machine_2": "opc.tcp://192.168.1.102:56000",
+}
+
+
+async def _cancel_tasks() -> None:
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+
+
+async def _create_queue() -> asyncio.Queue:
+    return asyncio.Queue()
+
+
+@pytest.fixture
+def background_loop():
+    """Start a background event loop and stop it after the test."""
+    loop, loop_thread = start_event_loop()
+    yield loop, loop_thread
+    asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result(timeout=1)
+    loop.call_soon_threadsafe(loop.stop)
+    loop_thread.join(timeout=1)
+    loop.close()
+
+
+@pytest.fixture
+def loop(background_loop):
+    """Background event loop."""
+    return background_loop[0]
+
+
+@pytest.fixture
+def changes(loop):
+    """Queue of changed machine names handed out by wait_for_changes."""
+    return asyncio.run_coroutine_threadsafe(_create_queue(), loop).result(timeout=1)
+
+
+@pytest.fixture
+def monitor(changes):
+    """Mock machine monitor."""
+    monitor = Mock()
+    monitor.machines = MACHINES
+    monitor.connected_count = 0
+    monitor.wait_for_changes = AsyncMock(side_effect=changes.get)
+    monitor.get_machine_update.side_effect = lambda machine_name: {'machine_name': machine_name}
+    return monitor
+
+
+@pytest.fixture
+def app(background_loop, monitor):
+    """Create a test application around the mock monitor."""
+    with patch('bystronic_opc.web.app.MachineMonitor', return_value=monitor), \
+            patch('bystronic_opc.web.app.start_event_loop', return_value=background_loop):
+        app = create_app({'TESTING': True, 'MACHINES': MACHINES})
+    return app
+
+
+def push_changes(loop, changes, changed):
+    """Report changed machines to the broadcaster."""
+    asyncio.run_coroutine_threadsafe(changes.put(set(changed)), loop).result(timeout=1)
+
+
+def wait_for_event(client, name, timeout=3):
+    """Collect a Socket.IO client's events until one named ``name`` arrives."""
+    received = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        received.extend(client.get_received())
+        if any(event['name'] == name for event in received):
+            return received
+        time.sleep(0.01)
+    raise AssertionError(f"No {name} event received")
+
+
+def events_named(received, name):
+    """Get the first arguments of all received events with a name."""
+    return [event['args'][0] for event in received if event['name'] == name]
+
+
+class TestEventLoop:
+    """Test suite for the shared event loop helpers."""
+    
+    def test_start_event_loop(self, background_loop):
+        """Test the loop runs coroutines in its background thread."""
+        loop, loop_thread = background_loop
+        
+        async def current_thread():
+            return threading.current_thread()
+        
+        result = asyncio.run_coroutine_threadsafe(current_thread(), loop).result(timeout=1)
+        
+        assert loop.is_running()
+        assert result is loop_thread
+        assert loop_thread.daemon
+    
+    def test_run_coroutine(self, app):
+        """Test a coroutine's result is returned to the caller."""
+        async def answer():
+            return 42
+        
+        assert run_coroutine(app, answer()) == 42
+    
+    def test_run_coroutine_timeout_cancels(self, app):
+        """Test a timed-out coroutine is cancelled on the loop."""
+        cancelled = threading.Event()
+        
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        with pytest.raises(concurrent.futures.TimeoutError):
+            run_coroutine(app, hang(), timeout=0.01)
+        
+        assert cancelled.wait(timeout=1)
+
+
+class TestOjsonify:
+    """Test suite for the JSON response helper."""
+    
+    def test_ojsonify_orjson(self, app):
+        """Test responses are encoded with orjson when it is installed."""
+        orjson = pytest.importorskip("orjson")
+        
+        with patch('bystronic_opc.web.app.orjson.dumps', wraps=orjson.dumps) as mock_dumps:
+            with app.app_context():
+                response = ojsonify({'machine_name': 'Machine_1', 'is_connected': True})
+        
+        mock_dumps.assert_called_once()
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data) == {'machine_name': 'Machine_1', 'is_connected': True}
+    
+    def test_ojsonify_without_orjson(self, app):
+        """Test responses fall back to Flask's encoder without orjson."""
+        with patch('bystronic_opc.web.app.orjson', None):
+            with app.app_context():
+                response = ojsonify({'machine_name': 'Machine_1', 'is_connected': True})
+        
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data) == {'machine_name': 'Machine_1', 'is_connected': True}
+
+
+class TestApiRoutes:
+    """Test suite for the API routes."""
+    
+    def test_all_machines_status(self, app, monitor):
+        """Test the monitor's pre-encoded status JSON is served as is."""
+        payload = b'{"Machine_1":{"is_connected":true,"current_job":null}}'
+        monitor.get_all_machine_status_json.return_value = payload
+        
+        response = app.test_client().get('/api/machines/status')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert response.data == payload
+        monitor.get_all_machine_status.assert_not_called()
+    
+    def test_machine_history_timeout(self, app, monitor):
+        """Test a timed-out history request returns 504."""
+        with patch('bystronic_opc.web.app.run_coroutine', side_effect=concurrent.futures.TimeoutError):
+            response = app.test_client().get('/api/machine/Machine_1/history')
+        
+        assert response.status_code == 504
+        assert response.get_json() == {'error': 'Timed out reading history from Machine_1'}
+    
+    def test_machine_screen_timeout(self, app, monitor):
+        """Test a timed-out screen request returns 504."""
+        with patch('bystronic_opc.web.app.run_coroutine', side_effect=concurrent.futures.TimeoutError):
+            response = app.test_client().get('/api/machine/Machine_1/screen')
+        
+        assert response.status_code == 504
+        assert response.get_json() == {'error': 'Timed out reading screen image from Machine_1'}
+    
+    def test_machine_history_cooldown(self, app, monitor):
+        """Test a machine in its connection cooldown returns 503 with Retry-After."""
+        monitor.run_on_client = AsyncMock(side_effect=ConnectionCooldownError("Connection recently failed"))
+        monitor.cooldown_remaining.return_value = 12.3
+        
+        response = app.test_client().get('/api/machine/Machine_1/history')
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '13'
+        assert response.get_json() == {'error': 'Connection recently failed'}
+        monitor.cooldown_remaining.assert_called_once_with('Machine_1')
+    
+    def test_machine_screen_unreachable(self, app, monitor):
+        """Test an unreachable machine returns 503."""
+        monitor.get_screen_image = AsyncMock(side_effect=ConnectionError("Failed to connect"))
+        monitor.cooldown_remaining.return_value = 0
+        
+        response = app.test_client().get('/api/machine/Machine_1/screen')
+        
+        assert response.status_code == 503
+        assert 'Retry-After' not in response.headers
+        assert response.get_json() == {'error': 'Failed to connect'}
+    
+    def test_machine_screen(self, app, monitor):
+        """Test the screen image is fetched on the shared loop."""
+        monitor.get_screen_image = AsyncMock(return_value=b'png data')
+        
+        response = app.test_client().get('/api/machine/Machine_1/screen')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        assert response.data == b'png data'
+        monitor.get_screen_image.assert_awaited_once_with('Machine_1')
+
+
+class TestBroadcast:
+    """Test suite for the Socket.IO status broadcaster."""
+    
+    def test_machine_update_to_subscribers(self, app, loop, changes):
+        """Test status changes are pushed to the machine's subscribers."""
+        client = app.socketio.test_client(app)
+        client.emit('subscribe_machine', {'machine_name': 'Machine_1'})
+        client.get_received()
+        
+        push_changes(loop, changes, ['Machine_1'])
+        received = wait_for_event(client, 'machine_update')
+        
+        assert events_named(received, 'machine_update') == [{'machine_name': 'Machine_1'}]
+    
+    def test_rooms_without_subscribers_skipped(self, app, monitor, loop, changes):
+        """Test no machine_update is built or sent for unwatched machines."""
+        subscriber = app.socketio.test_client(app)
+        subscriber.emit('subscribe_machine', {'machine_name': 'Machine_1'})
+        other = app.socketio.test_client(app)
+        subscriber.get_received()
+        other.get_received()
+        
+        monitor.connected_count = 1
+        push_changes(loop, changes, ['Machine_1', 'Machine_2'])
+        received = wait_for_event(subscriber, 'summary_update')
+        other_received = wait_for_event(other, 'summary_update')
+        
+        assert events_named(received, 'machine_update') == [{'machine_name': 'Machine_1'}]
+        assert events_named(other_received, 'machine_update') == []
+        monitor.get_machine_update.assert_called_once_with('Machine_1')
+    
+    def test_summary_update_on_count_change(self, app, monitor, loop, changes):
+        """Test the summary is only sent when the connected count changes."""
+        client = app.socketio.test_client(app)
+        client.emit('subscribe_machine', {'machine_name': 'Machine_1'})
+        client.get_received()
+        
+        monitor.connected_count = 1
+        push_changes(loop, changes, ['Machine_1'])
+        received = wait_for_event(client, 'summary_update')
+        
+        # Same count: machine update only
+        push_changes(loop, changes, ['Machine_1'])
+        received += wait_for_event(client, 'machine_update')
+        
+        monitor.connected_count = 2
+        push_changes(loop, changes, ['Machine_1'])
+        received += wait_for_event(client, 'summary_update')
+        
+        summaries = events_named(received, 'summary_update')
+        assert [summary['connected_machines'] for summary in summaries] == [1, 2]
+        assert all(summary['total_machines'] == 2 for summary in summaries)